@@ -2,6 +2,9 @@
 This module contains the Client class.
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
 
 class Client:
     """A class that stores the user agent string, client ID, and client secret.
@@ -10,6 +13,7 @@ class Client:
         user_agent (str): The user agent string.
         client_id (str): The client ID.
         client_secret (str): The client secret.
+        headers (Mapping[str, str]): Read-only headers for requests of client.
     """
 
     def __init__(self, user_agent: str, client_id: str, client_secret: str) -> None:
@@ -24,6 +28,7 @@ class Client:
         self.user_agent = user_agent
         self.client_id = client_id
         self.client_secret = client_secret
+        self.headers: Mapping[str, str] = MappingProxyType({"User-Agent": user_agent})
 
 
 KateMobile = Client(
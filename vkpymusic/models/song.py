@@ -4,6 +4,15 @@ This module contains the Song class.
 
 import re
 
+_UNSAFE_CHARS = re.compile(r"[^A-zА-я0-9+\s]")
+
+
+def _safe_format(string: str) -> str:
+    """
+    Removes all non-alphanumeric characters from the string.
+    """
+    return _UNSAFE_CHARS.sub("", string)
+
 
 class Song:
     """
@@ -68,13 +77,19 @@ class Song:
         """
         Removes all non-alphanumeric characters from the song's title and artist.
         """
+        self.title = _safe_format(self.title)
+        self.artist = _safe_format(self.artist)
 
-        def safe_format(string):
-            safe_string = re.sub(r"[^A-zА-я0-9+\s]", "", string)
-            return safe_string
+    @property
+    def safe_filename(self) -> str:
+        """
+        Filename for saving the song ('{title} - {artist}.mp3' without
+        non-alphanumeric characters).
 
-        self.title = safe_format(self.title)
-        self.artist = safe_format(self.artist)
+        Returns:
+            str: The safe filename of the song.
+        """
+        return f"{_safe_format(self.title)} - {_safe_format(self.artist)}.mp3"
 
     @classmethod
     def from_json(cls, item) -> "Song":
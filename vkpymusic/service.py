@@ -3,112 +3,74 @@ This module contains the main class 'Service' for working with VK API.
 """
 
 import os
-import configparser
-import json
 import logging
-from typing import Optional, Union, List, Tuple
+from typing import Any, Callable, Optional, Union, List
 
 import requests
 from requests import Response, Session
 
 from .models import Song, Playlist, UserInfo
+from .service_core import _ServiceCore, Params, T, CHUNK_SIZE, EXECUTE_LIMIT
 from .utils import Converter, create_logger
 
 
-class Service:
+class Service(_ServiceCore):
     """
     A class for working with VK API.
 
+    Each instance keeps one session for its requests, so connections
+    are reused. Use it as 'with' or call 'close' (optional) to release them.
+
     Attributes:
         user_agent (str): User agent string.
-        __token (str):    Token for VK API.
         logger (logging.Logger): The logger for class.
 
     Example usage:
     ```
-    >>> service = Service.parse_config()
-    >>> songs = service.search_songs_by_text("Imagine Dragons")
+    >>> with Service.parse_config() as service:
+    ...     songs = service.search_songs_by_text("Imagine Dragons")
     >>> for song in songs:
     ...     Service.save_music(song)
     ```
     """
     logger: logging.Logger = create_logger(__name__)
+    _session: Optional[Session] = None
 
-    #############
-    # CONSTRUCTOR
-    def __init__(
-            self,
-            user_agent: str,
-            token: str
-    ) -> None:
+    ###############################
+    # METHODS FOR SESSION LIFECYCLE
+    def _get_session(self) -> Session:
         """
-        Initializes a Service object.
+        Get session of this instance, creating it on first use. One session
+        is used for all requests, so connections to VK API are reused.
 
-        Args:
-            user_agent (str): User agent string.
-            token (str):      Token for VK API.
+        Returns:
+            Session: Session for requests.
         """
-        self.user_agent = user_agent
-        self.__token = token
+        if self._session is None:
+            self._session = Session()
+            self._session.headers.update(self._headers())
+        return self._session
 
-    @classmethod
-    def set_logger(cls, logger: logging.Logger) -> None:
+    def close(self) -> None:
         """
-        Set logger for class.
-
-        Args:
-            logger (logging.Logger): Logger.
+        Close session of this instance. A new one is created on next request.
         """
-        cls.logger = logger
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
-    ##################################
-    # METHODS WITH WORKING WITH CONFIG
-    @classmethod
-    def parse_config(cls, filename: str = "config_vk.ini"):
-        """
-        Create an instance of Service from config.
+    def __enter__(self) -> "Service":
+        return self
 
-        Args:
-            filename (str): Filename of config (default = "config_vk.ini").
-        """
-        dirname = os.path.dirname(__file__)
-        configfile_path = os.path.join(dirname, filename)
-        try:
-            config = configparser.ConfigParser()
-            config.read(configfile_path, encoding="utf-8")
-            user_agent = config["VK"]["user_agent"]
-            token = config["VK"]["token_for_audio"]
-            return cls(user_agent, token)
-        except Exception as e:
-            cls.logger.error("Config not found or invalid: " + str(e))
-
-    @classmethod
-    def del_config(cls, filename: str = "config_vk.ini"):
-        """
-        Delete config created by 'TokenReceiver'.
-
-        Args:
-            filename (str): Filename of config (default value = "config_vk.ini").
-        """
-        configfile_path = os.path.join(os.path.dirname(__file__), filename)
-        try:
-            os.remove(configfile_path)
-            cls.logger.info("Config successful deleted!")
-        except Exception as e:
-            cls.logger.warning(e)
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     ##############################################
     # METHODS FOR WORKING WITH TOKEN AND USER INFO
-    @staticmethod
-    def __get_profile_info(token: str) -> Response:
-        url = "https://api.vk.com/method/account.getProfileInfo"
-        parameters = [
-            ("access_token", token),
-            ("https", 1),
-            ("lang", "ru"),
-            ("extended", 1),
-            ("v", "5.131"),
-        ]
+    @classmethod
+    def _get_profile_info(cls, token: str) -> Response:
+        url = cls._PROFILE_INFO_URL
+        parameters = cls._base_params(token)
         with Session() as session:
             response: Response = session.post(url=url, data=parameters)
         return response
@@ -126,19 +88,11 @@ class Service:
         """
         cls.logger.info("Checking token...")
         try:
-            response = cls.__get_profile_info(token)
-            data = json.loads(response.content.decode("utf-8"))
-            if "error" in data:
-                cls.logger.error("Token is invalid!")
-                return False
-            if "id" in data["response"]:
-                cls.logger.info("Token is valid!")
-                return True
+            response = cls._get_profile_info(token)
+            return cls._is_valid_profile_response(response.content, token)
         except Exception as e:
             cls.logger.error(e)
             return False
-        cls.logger.info("Token is valid!")
-        return True
 
     def is_token_valid(self) -> bool:
         """
@@ -147,7 +101,13 @@ class Service:
         Returns:
             bool: True if token is valid, False otherwise.
         """
-        return self.check_token(self.__token)
+        self.logger.info("Checking token...")
+        try:
+            response = self._get_own_profile_info()
+            return self._is_valid_profile_response(response.content, self._own_token())
+        except Exception as e:
+            self.logger.error(e)
+            return False
 
     def get_user_info(self) -> Optional[UserInfo]:
         """
@@ -158,7 +118,7 @@ class Service:
         """
         self.logger.info("Getting user info...")
         try:
-            response: Response = self.__get_profile_info(self.__token)
+            response: Response = self._get_own_profile_info()
             user_info: UserInfo = Converter.response_to_userinfo(response)
         except Exception as e:
             self.logger.error(e)
@@ -170,109 +130,25 @@ class Service:
     # PRIVATE METHODS FOR CREATING REQUESTS
 
     # Main method for creating requests
-    def __get_response(
-        self, method: str, params: List[Tuple[str, Union[str, int]]]
-    ) -> Response:
-        headers = {"User-Agent": self.user_agent}
-        url = f"https://api.vk.com/method/audio.{method}"
-        parameters = [
-            ("access_token", self.__token),
-            ("https", 1),
-            ("lang", "ru"),
-            ("extended", 1),
-            ("v", "5.131"),
-        ]
-        for pair in params:
-            parameters.append(pair)
-        with Session() as session:
-            session.headers.update(headers)
-            response = session.post(url=url, data=parameters)
-        return response
-
-    # Other methods
-    def __get_count(self, user_id: int) -> Response:
-        params = [("owner_id", user_id)]
-        return self.__get_response("getCount", params)
+    def _request(self, method: str, params: Params) -> Response:
+        url, parameters = self._build_request(method, params)
+        return self._get_session().post(url=url, data=parameters)
 
-    def __get(
+    # Common method for requests returning list of songs/playlists
+    def _fetch_list(
         self,
-        user_id: int,
-        count: int = 100,
-        offset: int = 0,
-        playlist_id: Optional[int] = None,
-        access_key: Optional[str] = None,
-    ) -> Response:
-        params = [
-            ("owner_id", user_id),
-            ("count", count),
-            ("offset", offset),
-        ]
-        if playlist_id:
-            params.append(("album_id", playlist_id))
-            params.append(("access_key", access_key))
-        return self.__get_response("get", params)
-
-    def __search(self, text: str, count: int = 100, offset: int = 0) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-            ("sort", 0),
-            ("autocomplete", 1),
-        ]
-        return self.__get_response("search", params)
-
-    def __get_playlists(
-        self, user_id: int, count: int = 50, offset: int = 0
-    ) -> Response:
-        params = [
-            ("owner_id", user_id),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return self.__get_response("getPlaylists", params)
-
-    def __search_playlists(
-        self, text: str, count: int = 50, offset: int = 0
-    ) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return self.__get_response("searchPlaylists", params)
-
-    def __search_albums(self, text: str, count: int = 50, offset: int = 0) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return self.__get_response("searchAlbums", params)
-
-    def __get_popular(self, count: int = 500, offset: int = 0) -> Response:
-        params = [
-            ("count", count),
-            ("offset", offset),
-        ]
-        return self.__get_response("getPopular", params)
-
-    def __get_recommendations(
-            self,
-            user_id: Optional[int] = None,
-            song_id: Optional[int] = None,
-            count: int = 300,
-            offset: int = 0
-    ) -> Response:
-        params = [
-            ("count", count),
-            ("offset", offset),
-        ]
-        if user_id:
-            params.append(("user_id", user_id))
-        if song_id:
-            params.append(("target_id", song_id))
-        return self.__get_response("getRecommendations", params)
+        converter: Callable[[Response], List[T]],
+        request: Callable[..., Response],
+        *args: Any,
+    ) -> List[T]:
+        try:
+            response = request(*args)
+            items = converter(response)
+        except Exception as e:
+            self.logger.error(e)
+            return []
+        self._log_results(items)
+        return items
 
     #####################
     # MAIN PUBLIC METHODS
@@ -286,12 +162,12 @@ class Service:
         Returns:
             int: count of all user's songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
         try:
-            response = self.__get_count(user_id)
-            data = json.loads(response.content.decode("utf-8"))
-            songs_count = int(data["response"])
+            response = self._get_count(user_id)
+            songs_count = self._parse_count(response.content)
         except Exception as e:
             self.logger.error(e)
             return 0
@@ -312,21 +188,12 @@ class Service:
         Returns:
             list[Song]: List of songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
-        try:
-            response: Response = self.__get(user_id, count, offset)
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return self._fetch_list(
+            Converter.response_to_songs, self._get, user_id, count, offset
+        )
 
     def get_songs_by_playlist_id(
         self,
@@ -349,23 +216,18 @@ class Service:
         Returns:
             list[Song]: List of songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
-        try:
-            response: Response = self.__get(
-                user_id, count, offset, playlist_id, access_key
-            )
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return self._fetch_list(
+            Converter.response_to_songs,
+            self._get,
+            user_id,
+            count,
+            offset,
+            playlist_id,
+            access_key,
+        )
 
     def get_songs_by_playlist(
         self, playlist: Playlist, count: int = 10, offset: int = 0
@@ -382,25 +244,44 @@ class Service:
             list[Song]: List of songs.
         """
         self.logger.info(f"Request by playlist: {playlist}")
+        return self._fetch_list(
+            Converter.response_to_songs,
+            self._get,
+            playlist.owner_id,
+            count,
+            offset,
+            playlist.playlist_id,
+            playlist.access_key,
+        )
+
+    def get_songs_by_playlists(
+        self, playlists: List[Playlist], count: int = 100
+    ) -> List[List[Song]]:
+        """
+        Get songs of several playlists. Playlists are requested in batches
+        of 25 per request (VK method 'execute').
+
+        Args:
+            playlists (list[Playlist]): Instances of 'Playlist' (take from methods for receiving Playlist).
+            count (int):                Count of resulting songs per playlist (for VK API: default/max = 100).
+
+        Returns:
+            list[list[Song]]: List of songs for each playlist (in the same order).
+        """
+        self.logger.info(f"Request by playlists: {len(playlists)}")
+        calls = [self._playlist_call(playlist, count) for playlist in playlists]
+        songs_by_playlists: List[List[Song]] = []
         try:
-            response: Response = self.__get(
-                playlist.owner_id,
-                count,
-                offset,
-                playlist.playlist_id,
-                playlist.access_key,
-            )
-            songs = Converter.response_to_songs(response)
+            for i in range(0, len(calls), EXECUTE_LIMIT):
+                response: Response = self._execute(calls[i : i + EXECUTE_LIMIT])
+                songs_by_playlists.extend(Converter.response_to_songs_batch(response))
         except Exception as e:
             self.logger.error(e)
             return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        self.logger.info(
+            f"Count of songs: {sum(len(songs) for songs in songs_by_playlists)}"
+        )
+        return songs_by_playlists
 
     def search_songs_by_text(
         self, text: str, count: int = 3, offset: int = 0
@@ -417,19 +298,9 @@ class Service:
             list[Song]: List of songs.
         """
         self.logger.info(f'Request by text: "{text}" в количестве {count}')
-        try:
-            response: Response = self.__search(text, count, offset)
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return self._fetch_list(
+            Converter.response_to_songs, self._search, text, count, offset
+        )
 
     def get_playlists_by_userid(
         self, user_id: Union[str, int], count: int = 5, offset: int = 0
@@ -445,21 +316,12 @@ class Service:
         Returns:
             list[Playlist]: List of playlists.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
-        try:
-            response = self.__get_playlists(user_id, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return self._fetch_list(
+            Converter.response_to_playlists, self._get_playlists, user_id, count, offset
+        )
 
     def search_playlists_by_text(
         self, text: str, count: int = 5, offset: int = 0
@@ -477,19 +339,9 @@ class Service:
             list[Playlist]: List of playlists.
         """
         self.logger.info(f"Request by text: {text}")
-        try:
-            response: Response = self.__search_playlists(text, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return self._fetch_list(
+            Converter.response_to_playlists, self._search_playlists, text, count, offset
+        )
 
     def search_albums_by_text(
         self, text: str, count: int = 5, offset: int = 0
@@ -508,19 +360,9 @@ class Service:
             list[Playlist]: List of albums.
         """
         self.logger.info(f"Request by text: {text}")
-        try:
-            response: Response = self.__search_albums(text, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return self._fetch_list(
+            Converter.response_to_playlists, self._search_albums, text, count, offset
+        )
 
     def get_popular(self, count: int = 50, offset: int = 0) -> List[Song]:
         """
@@ -534,19 +376,9 @@ class Service:
             list[Song]: List of songs.
         """
         self.logger.info("Request popular songs")
-        try:
-            response: Response = self.__get_popular(count, offset)
-            songs = Converter.response_to_popular(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return self._fetch_list(
+            Converter.response_to_popular, self._get_popular, count, offset
+        )
 
     def get_recommendations(
         self,
@@ -570,64 +402,56 @@ class Service:
         self.logger.info(
             f"Request recommendations by user id: {user_id or '[NOT SET]'} and song id: {song_id or '[NOT SET]'}"
         )
-        try:
-            response: Response = self.__get_recommendations(
-                user_id, song_id, count, offset
-            )
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return self._fetch_list(
+            Converter.response_to_songs,
+            self._get_recommendations,
+            user_id,
+            song_id,
+            count,
+            offset,
+        )
 
     ################
     # EXTENSION METHODS
     @classmethod
-    def save_music(cls, song: Song) -> Optional[str]:
+    def save_music(cls, song: Song, music_dir: Optional[str] = None) -> Optional[str]:
         """
         Save song to '{workDirectory}/Music/{song name}.mp3'.
 
         Args:
             song (Song): 'Song' instance obtained from 'Service' methods.
+            music_dir (Optional[str]): Folder for music (default = '{workDirectory}/Music').
 
         Returns:
             str: relative path of downloaded music.
         """
-        song.to_safe()
-        file_name_mp3 = f"{song}.mp3"
-        url = song.url
-        if url == "":
-            cls.logger.warning("Url no found")
+        file_path = cls._get_file_path(song, music_dir)
+        if not file_path:
             return
-        response = requests.get(url=url)
-        if response.status_code == 200:
-            if not os.path.exists("Music"):
-                os.makedirs("Music")
-                cls.logger.info("Folder 'Music' was created")
-            file_path = os.path.join(os.getcwd(), "Music", file_name_mp3)
-            if not os.path.exists(file_path):
-                if "index.m3u8" in url:
-                    cls.logger.error(".m3u8 detected!")
-                    return
-            else:
-                cls.logger.warning(
-                    f"File with name {file_name_mp3} exists. Overwrite it? (Y/n)"
-                )
-                res = input().lower()
-                if res.lower() != "y" and res.lower() != "yes":
-                    return
-        else:
-            cls.logger.error(f"Error while downloading {song}: {response.status_code}")
-            return
-        response.close()
-        cls.logger.info(f"Downloading {song}...")
-        with open(file_path, "wb") as output_file:
-            output_file.write(response.content)
+        file_name_mp3 = os.path.basename(file_path)
+        if os.path.exists(file_path):
+            # Skip downloading if the remote file has the same size
+            head = requests.head(url=song.url, allow_redirects=True)
+            if head.status_code == 200 and cls._is_up_to_date(file_path, head.headers):
+                cls.logger.info(f"File with name {file_name_mp3} is up to date.")
+                return file_path
+            cls.logger.warning(
+                f"File with name {file_name_mp3} exists. Overwrite it? (Y/n)"
+            )
+            res = input().lower()
+            if res != "y" and res != "yes":
+                return
+        # MP3 is already compressed, so ask server not to gzip it;
+        # body is streamed to file by chunks instead of loading it in memory
+        with requests.get(
+            url=song.url, headers={"Accept-Encoding": "identity"}, stream=True
+        ) as response:
+            if response.status_code != 200:
+                cls.logger.error(f"Error while downloading {song}: {response.status_code}")
+                return
+            cls.logger.info(f"Downloading {song}...")
+            with open(file_path, "wb") as output_file:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    output_file.write(chunk)
         cls.logger.info(f"Success! Music was downloaded in '{file_path}'")
         return file_path
@@ -2,104 +2,130 @@
 This module contains the main class 'ServiceAsync' for async working with VK API.
 """
 import os
-import json
-import configparser
+import asyncio
 import logging
-from typing import Optional, Union, Tuple, List
+from typing import Any, Awaitable, Callable, Dict, Optional, Union, List
 
 import aiofiles
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Limits, Response
 
 from .models import Song, Playlist, UserInfo
-from .utils import Converter, create_logger
+from .service_core import _ServiceCore, Params, T, CHUNK_SIZE, EXECUTE_LIMIT
+from .utils import Converter, RateLimiter, create_logger
+from .utils._http2 import HTTP2
 
 
-class ServiceAsync:
+def _create_client(headers: Optional[Dict[str, str]] = None) -> AsyncClient:
+    """
+    Create a client with HTTP/2 (if 'h2' is installed) and connection limits.
+
+    Args:
+        headers (Optional[Dict[str, str]]): Headers sent with every request.
+
+    Returns:
+        AsyncClient: New instance of 'AsyncClient'.
+    """
+    return AsyncClient(
+        http2=HTTP2,
+        headers=headers,
+        limits=Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=30.0,
+    )
+
+
+class ServiceAsync(_ServiceCore):
     """
     A class that provides methods for working with VK API.
 
+    Each instance keeps one HTTP client for its requests, so connections
+    are reused. Use it as 'async with' or call 'aclose' (optional) to
+    release them.
+
+    Requests to VK API are limited by 'api_limit' per second
+    (VK allows 3 per second for user token).
+
     Attributes:
         user_agent (str): The user agent string.
-        __token (str): The access token.
         logger (logging.Logger): The logger for class.
 
     Example usage:
     ```
     >>> import asyncio
     >>>
-    >>> service = ServiceAsync.parse_config()
-    >>> songs = asyncio.run(service.search_songs_by_text("Imagine Dragons"))
-    >>> song = songs[0]
-    >>> asyncio.run(ServiceAsync.save_music(song))
+    >>> async def main():
+    ...     async with ServiceAsync.parse_config() as service:
+    ...         songs = await service.search_songs_by_text("Imagine Dragons")
+    ...         await ServiceAsync.save_music(songs[0])
+    >>>
+    >>> asyncio.run(main())
     ```
     """
     logger: logging.Logger = create_logger(__name__)
+    _client: Optional[AsyncClient] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
 
     #############
-    # Constructor
+    # CONSTRUCTOR
     def __init__(
             self,
             user_agent: str,
-            token: str
+            token: str,
+            api_limit: Optional[int] = 3,
+            api_request_mode: str = "sequential",
     ) -> None:
         """
-        Initializes a ServiceAsync object.
+        Initializes a service object.
 
         Args:
-            user_agent (str): The user agent string.
-            token (str): The access token.
+            user_agent (str):       User agent string.
+            token (str):            Token for VK API.
+            api_limit (Optional[int]): Max count of requests per second (None - no limit).
+            api_request_mode (str): 'sequential' (evenly spaced requests) or 'burst'
+                (up to 'api_limit' requests at once).
         """
-        self.user_agent = user_agent
-        self.__token = token
+        super().__init__(user_agent, token)
+        self._rate_limiter: Optional[RateLimiter] = (
+            RateLimiter(api_limit, api_request_mode) if api_limit else None
+        )
 
-    ##################################
-    # METHODS WITH WORKING WITH CONFIG
-    @classmethod
-    def parse_config(cls, filename: str = "config_vk.ini"):
+    ##############################
+    # METHODS FOR CLIENT LIFECYCLE
+    def _get_client(self) -> AsyncClient:
         """
-        Create an instance of ServiceAsync from config.
+        Get client of this instance, creating it on first use
+        (or if it was closed or created in another event loop).
 
-        Args:
-            filename (str): Filename of config (default = "config_vk.ini").
+        Returns:
+            AsyncClient: Client for requests.
         """
-        configfile_path = os.path.join(os.path.dirname(__file__), filename)
-        try:
-            config = configparser.ConfigParser()
-            config.read(configfile_path, encoding="utf-8")
-            user_agent = config["VK"]["user_agent"]
-            token = config["VK"]["token_for_audio"]
-            return cls(user_agent, token)
-        except Exception as e:
-            cls.logger.error("Config not found or invalid: " + str(e))
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = _create_client(headers=self._headers())
+            self._client_loop = loop
+        return self._client
 
-    @classmethod
-    def del_config(cls, filename: str = "config_vk.ini"):
+    async def aclose(self) -> None:
         """
-        Delete config created by 'TokenReceiver'.
-
-        Args:
-            filename (str): Filename of config (default = "config_vk.ini").
+        Close client of this instance. A new one is created on next request.
         """
-        configfile_path = os.path.join(os.path.dirname(__file__), filename)
-        try:
-            os.remove(configfile_path)
-            cls.logger.info("Config successful deleted!")
-        except Exception as e:
-            cls.logger.warning(e)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "ServiceAsync":
+        self._get_client()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
 
     ##############################################
     # METHODS FOR WORKING WITH TOKEN AND USER INFO
-    @staticmethod
-    async def __get_profile_info(token: str) -> Response:
-        url = "https://api.vk.com/method/account.getProfileInfo"
-        parameters = [
-            ("access_token", token),
-            ("https", 1),
-            ("lang", "ru"),
-            ("extended", 1),
-            ("v", "5.131"),
-        ]
-        async with AsyncClient() as session:
+    @classmethod
+    async def _get_profile_info(cls, token: str) -> Response:
+        url = cls._PROFILE_INFO_URL
+        parameters = cls._base_params(token)
+        async with _create_client() as session:
             response = await session.post(url=url, params=parameters)
         return response
 
@@ -108,24 +134,19 @@ class ServiceAsync:
         """
         Check token for VK API.
 
+        Args:
+            token (str): Token for VK API.
+
         Returns:
             bool: True if token is valid, False otherwise.
         """
         cls.logger.info("Checking token...")
         try:
-            response = await cls.__get_profile_info(token)
-            data = json.loads(response.content.decode("utf-8"))
-            if "error" in data or "id" not in data:
-                cls.logger.error("Token is invalid!")
-                return False
-            if "id" in data["response"]:
-                cls.logger.info("Token is valid!")
-                return True
+            response = await cls._get_profile_info(token)
+            return cls._is_valid_profile_response(response.content, token)
         except Exception as e:
             cls.logger.error(e)
             return False
-        cls.logger.info("Token is valid!")
-        return True
 
     async def is_token_valid(self) -> bool:
         """
@@ -135,7 +156,12 @@ class ServiceAsync:
             bool: True if token is valid, False otherwise.
         """
         self.logger.info("Checking token...")
-        return await self.check_token(self.__token)
+        try:
+            response = await self._get_own_profile_info()
+            return self._is_valid_profile_response(response.content, self._own_token())
+        except Exception as e:
+            self.logger.error(e)
+            return False
 
     async def get_user_info(self) -> Optional[UserInfo]:
         """
@@ -146,7 +172,7 @@ class ServiceAsync:
         """
         self.logger.info("Getting user info...")
         try:
-            response: Response = await self.__get_profile_info(self.__token)
+            response: Response = await self._get_own_profile_info()
             user_info = Converter.response_to_userinfo(response)
         except Exception as e:
             self.logger.error(e)
@@ -158,107 +184,28 @@ class ServiceAsync:
     # PRIVATE METHODS FOR CREATING REQUESTS
 
     # Main method for creating requests
-    async def __get_response(
-        self, method: str, params: List[Tuple[str, Union[str, int]]]
-    ) -> Response:
-        headers = {"User-Agent": self.user_agent}
-        url = f"https://api.vk.com/method/audio.{method}"
-        parameters = [
-            ("access_token", self.__token),
-            ("https", 1),
-            ("lang", "ru"),
-            ("extended", 1),
-            ("v", "5.131"),
-        ]
-        for pair in params:
-            parameters.append(pair)
-        async with AsyncClient() as session:
-            session.headers.update(headers)
-            response = await session.post(url=url, params=parameters)
-        return response
-
-    # Others methods for creating requests
-    async def __get_count(self, user_id: int) -> Response:
-        params = [("owner_id", user_id)]
-        return await self.__get_response("getCount", params)
-
-    async def __get(
+    async def _request(self, method: str, params: Params) -> Response:
+        # Headers are already set in client
+        url, parameters = self._build_request(method, params)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        return await self._get_client().post(url=url, params=parameters)
+
+    # Common method for requests returning list of songs/playlists
+    async def _fetch_list(
         self,
-        user_id: int,
-        count: int = 100,
-        offset: int = 0,
-        playlist_id: Optional[int] = None,
-        access_key: Optional[str] = None,
-    ) -> Response:
-        params = [("owner_id", user_id), ("count", count), ("offset", offset)]
-        if playlist_id:
-            params.append(("album_id", playlist_id))
-            params.append(("access_key", access_key))
-        return await self.__get_response("get", params)
-
-    async def __search(self, text: str, count: int = 100, offset: int = 0) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-            ("sort", 0),
-            ("autocomplete", 1),
-        ]
-        return await self.__get_response("search", params)
-
-    async def __get_playlists(
-        self, user_id: int, count: int = 50, offset: int = 0
-    ) -> Response:
-        params = [
-            ("owner_id", user_id),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return await self.__get_response("getPlaylists", params)
-
-    async def __search_playlists(
-        self, text: str, count: int = 50, offset: int = 0
-    ) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return await self.__get_response("searchPlaylists", params)
-
-    async def __search_albums(
-        self, text: str, count: int = 50, offset: int = 0
-    ) -> Response:
-        params = [
-            ("q", text),
-            ("count", count),
-            ("offset", offset),
-        ]
-        return await self.__get_response("searchAlbums", params)
-
-    async def __get_popular(self, count: int = 500, offset: int = 0) -> Response:
-        params = [
-            ("count", count),
-            ("offset", offset),
-        ]
-        return await self.__get_response("getPopular", params)
-
-    async def __get_recommendations(
-        self,
-        user_id: Optional[int] = None,
-        song_id: Optional[int] = None,
-        count: int = 300,
-        offset: int = 0,
-    ) -> Response:
-        params = [
-            ("count", count),
-            ("offset", offset),
-        ]
-        if user_id:
-            params.append(("user_id", user_id))
-        if song_id:
-            params.append(("target_id", song_id))
-        return await self.__get_response("getRecommendations", params)
+        converter: Callable[[Response], List[T]],
+        request: Callable[..., Awaitable[Response]],
+        *args: Any,
+    ) -> List[T]:
+        try:
+            response = await request(*args)
+            items = converter(response)
+        except Exception as e:
+            self.logger.error(e)
+            return []
+        self._log_results(items)
+        return items
 
     #####################
     # MAIN PUBLIC METHODS
@@ -272,12 +219,12 @@ class ServiceAsync:
         Returns:
             int: count of all user's songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
         try:
-            response = await self.__get_count(user_id)
-            data = json.loads(response.content.decode("utf-8"))
-            songs_count = int(data["response"])
+            response = await self._get_count(user_id)
+            songs_count = self._parse_count(response.content)
         except Exception as e:
             self.logger.error(e)
             return 0
@@ -298,21 +245,12 @@ class ServiceAsync:
         Returns:
             list[Song]: List of songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
-        try:
-            response: Response = await self.__get(user_id, count, offset)
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return await self._fetch_list(
+            Converter.response_to_songs, self._get, user_id, count, offset
+        )
 
     async def get_songs_by_playlist_id(
         self,
@@ -335,23 +273,18 @@ class ServiceAsync:
         Returns:
             list[Song]: List of songs.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
-        try:
-            response: Response = await self.__get(
-                user_id, count, offset, playlist_id, access_key
-            )
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return await self._fetch_list(
+            Converter.response_to_songs,
+            self._get,
+            user_id,
+            count,
+            offset,
+            playlist_id,
+            access_key,
+        )
 
     async def get_songs_by_playlist(
         self, playlist: Playlist, count: int = 10, offset: int = 0
@@ -368,25 +301,51 @@ class ServiceAsync:
             list[Song]: List of songs.
         """
         self.logger.info(f"Request by playlist: {playlist}")
+        return await self._fetch_list(
+            Converter.response_to_songs,
+            self._get,
+            playlist.owner_id,
+            count,
+            offset,
+            playlist.playlist_id,
+            playlist.access_key,
+        )
+
+    async def get_songs_by_playlists(
+        self, playlists: List[Playlist], count: int = 100
+    ) -> List[List[Song]]:
+        """
+        Get songs of several playlists. Playlists are requested in batches
+        of 25 per request (VK method 'execute').
+
+        Args:
+            playlists (list[Playlist]): Instances of 'Playlist' (take from methods for receiving Playlist).
+            count (int):                Count of resulting songs per playlist (for VK API: default/max = 100).
+
+        Returns:
+            list[list[Song]]: List of songs for each playlist (in the same order).
+        """
+        self.logger.info(f"Request by playlists: {len(playlists)}")
+        calls = [self._playlist_call(playlist, count) for playlist in playlists]
         try:
-            response: Response = await self.__get(
-                playlist.owner_id,
-                count,
-                offset,
-                playlist.playlist_id,
-                playlist.access_key,
+            responses = await asyncio.gather(
+                *(
+                    self._execute(calls[i : i + EXECUTE_LIMIT])
+                    for i in range(0, len(calls), EXECUTE_LIMIT)
+                )
             )
-            songs = Converter.response_to_songs(response)
+            songs_by_playlists = [
+                songs
+                for response in responses
+                for songs in Converter.response_to_songs_batch(response)
+            ]
         except Exception as e:
             self.logger.error(e)
             return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        self.logger.info(
+            f"Count of songs: {sum(len(songs) for songs in songs_by_playlists)}"
+        )
+        return songs_by_playlists
 
     async def search_songs_by_text(
         self, text: str, count: int = 3, offset: int = 0
@@ -403,18 +362,42 @@ class ServiceAsync:
             list[Song]: List of songs.
         """
         self.logger.info(f'Request by text: "{text}" в количестве {count}')
+        return await self._fetch_list(
+            Converter.response_to_songs, self._search, text, count, offset
+        )
+
+    async def search_songs_by_text_paged(
+        self, text: str, total: int, page: int = 100, concurrency: int = 3
+    ) -> List[Song]:
+        """
+        Search songs by text/query, requesting all pages concurrently.
+
+        Args:
+            text (str):        Text of query. Can be title of song, author, etc.
+            total (int):       Total count of resulting songs.
+            page (int):        Count of songs per request (for VK API: default/max = 100).
+            concurrency (int): Max count of simultaneous requests (VK API limit = 3 per second).
+
+        Returns:
+            list[Song]: List of songs.
+        """
+        self.logger.info(f'Request by text: "{text}" в количестве {total}')
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_page(offset: int) -> List[Song]:
+            async with semaphore:
+                response = await self._search(text, min(page, total - offset), offset)
+            return Converter.response_to_songs(response)
+
         try:
-            response: Response = await self.__search(text, count, offset)
-            songs = Converter.response_to_songs(response)
+            pages = await asyncio.gather(
+                *(fetch_page(offset) for offset in range(0, total, page))
+            )
         except Exception as e:
             self.logger.error(e)
             return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
+        songs = [song for songs_page in pages for song in songs_page]
+        self._log_results(songs)
         return songs
 
     async def get_playlists_by_userid(
@@ -431,22 +414,13 @@ class ServiceAsync:
         Returns:
             list[Playlist]: List of playlists.
         """
-        user_id = int(user_id)
+        if type(user_id) is not int:
+            user_id = int(user_id)
         self.logger.info(f"Request by user: {user_id}")
 
-        try:
-            response: Response = await self.__get_playlists(user_id, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return await self._fetch_list(
+            Converter.response_to_playlists, self._get_playlists, user_id, count, offset
+        )
 
     async def search_playlists_by_text(
         self, text: str, count: int = 5, offset: int = 0
@@ -464,19 +438,9 @@ class ServiceAsync:
             list[Playlist]: List of playlists.
         """
         self.logger.info(f"Request by text: {text}")
-        try:
-            response: Response = await self.__search_playlists(text, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return await self._fetch_list(
+            Converter.response_to_playlists, self._search_playlists, text, count, offset
+        )
 
     async def search_albums_by_text(
         self, text: str, count: int = 5, offset: int = 0
@@ -495,19 +459,9 @@ class ServiceAsync:
             list[Playlist]: List of albums.
         """
         self.logger.info(f"Request by text: {text}")
-        try:
-            response: Response = await self.__search_albums(text, count, offset)
-            playlists = Converter.response_to_playlists(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(playlists) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, playlist in enumerate(playlists, start=1):
-                self.logger.info(f"{i}) {playlist}")
-        return playlists
+        return await self._fetch_list(
+            Converter.response_to_playlists, self._search_albums, text, count, offset
+        )
 
     async def get_popular_songs(self, count: int = 50, offset: int = 0) -> List[Song]:
         """
@@ -521,19 +475,9 @@ class ServiceAsync:
             list[Song]: List of songs.
         """
         self.logger.info(f"Request popular songs")
-        try:
-            response: Response = await self.__get_popular(count, offset)
-            songs = Converter.response_to_popular(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return await self._fetch_list(
+            Converter.response_to_popular, self._get_popular, count, offset
+        )
 
     async def get_recommendations(
         self,
@@ -555,59 +499,104 @@ class ServiceAsync:
             list[Song]: List of songs.
         """
         self.logger.info(f"Request recommendations")
-        try:
-            response: Response = await self.__get_recommendations(
-                user_id, song_id, count, offset
-            )
-            songs = Converter.response_to_songs(response)
-        except Exception as e:
-            self.logger.error(e)
-            return []
-        if len(songs) == 0:
-            self.logger.info("No results found ._.")
-        else:
-            self.logger.info("Results:")
-            for i, song in enumerate(songs, start=1):
-                self.logger.info(f"{i}) {song}")
-        return songs
+        return await self._fetch_list(
+            Converter.response_to_songs,
+            self._get_recommendations,
+            user_id,
+            song_id,
+            count,
+            offset,
+        )
 
     ################
     # EXTENSION METHODS
     @classmethod
-    async def save_music(cls, song: Song, overwrite: bool = False) -> Optional[str]:
+    async def _download(
+        cls, session: AsyncClient, song: Song, overwrite: bool, music_dir: Optional[str]
+    ) -> Optional[str]:
+        file_path = cls._get_file_path(song, music_dir)
+        if not file_path:
+            return
+        file_name_mp3 = os.path.basename(file_path)
+        if os.path.exists(file_path):
+            cls.logger.warning(f"File with name '{file_name_mp3}' exists.")
+            if not overwrite:
+                return file_path
+            # Skip downloading if the remote file has the same size
+            head = await session.head(url=song.url, follow_redirects=True)
+            if head.status_code == 200 and cls._is_up_to_date(file_path, head.headers):
+                cls.logger.info(f"File with name '{file_name_mp3}' is up to date.")
+                return file_path
+        # MP3 is already compressed, so ask server not to gzip it;
+        # body is streamed to file by chunks instead of loading it in memory
+        async with session.stream(
+            "GET", url=song.url, headers={"Accept-Encoding": "identity"}
+        ) as response:
+            if response.status_code != 200:
+                cls.logger.error(f"Error while downloading {song}: {response.status_code}")
+                return
+            cls.logger.info(f"Downloading {song}...")
+            async with aiofiles.open(file_path, "wb") as output_file:
+                async for chunk in response.aiter_bytes(chunk_size=CHUNK_SIZE):
+                    await output_file.write(chunk)
+        cls.logger.info(f"Success! Music was downloaded in '{file_path}'")
+        return file_path
+
+    @classmethod
+    async def save_music(
+        cls, song: Song, overwrite: bool = False, music_dir: Optional[str] = None
+    ) -> Optional[str]:
         """
         Save song to '{workDirectory}/Music/{song name}.mp3'.
 
         Args:
             song (Song): 'Song' instance obtained from 'ServiceAsync' methods.
             overwrite (bool): Overwrite file if it exists
+            music_dir (Optional[str]): Folder for music (default = '{workDirectory}/Music').
 
         Returns:
             str: relative path of downloaded music.
         """
-        song.to_safe()
-        file_name_mp3 = f"{song}.mp3"
-        url = song.url
-        async with AsyncClient() as session:
-            response = await session.get(url=url)
-            if response.status_code == 200:
-                if not os.path.exists("Music"):
-                    os.makedirs("Music")
-                    cls.logger.info("Folder 'Music' was created")
-                file_path = os.path.join(os.getcwd(), "Music", file_name_mp3)
-                if not os.path.exists(file_path):
-                    if "index.m3u8" in url:
-                        cls.logger.error(".m3u8 detected!")
-                        return
-                else:
-                    cls.logger.warning(f"File with name '{file_name_mp3}' exists.")
-                    if not overwrite:
-                        return file_path
-            else:
-                cls.logger.error(f"Error while downloading {song}: {response.status_code}")
-                return
-            cls.logger.info(f"Downloading {song}...")
-            async with aiofiles.open(file_path, "wb") as output_file:
-                await output_file.write(response.read())
-        cls.logger.info(f"Success! Music was downloaded in '{file_path}'")
-        return file_path
+        async with _create_client() as session:
+            return await cls._download(session, song, overwrite, music_dir)
+
+    async def save_musics(
+        self,
+        songs: List[Song],
+        concurrency: int = 8,
+        overwrite: bool = False,
+        music_dir: Optional[str] = None,
+    ) -> List[Optional[str]]:
+        """
+        Save several songs concurrently using client of this instance.
+
+        Args:
+            songs (list[Song]): 'Song' instances obtained from 'ServiceAsync' methods.
+            concurrency (int): Max count of simultaneous downloads.
+            overwrite (bool): Overwrite files if they exist
+            music_dir (Optional[str]): Folder for music (default = '{workDirectory}/Music').
+
+        Returns:
+            list[Optional[str]]: Paths of downloaded music (None for failed ones).
+        """
+        # Create folder once instead of in every download
+        music_dir = self._ensure_music_dir(music_dir)
+        semaphore = asyncio.Semaphore(concurrency)
+        client = self._get_client()
+
+        async def download(song: Song) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self._download(client, song, overwrite, music_dir)
+                except Exception as e:
+                    self.logger.error(f"Error while downloading {song}: {e}")
+
+        # Songs with the same name are saved to the same file, so each file
+        # is downloaded once and its path is returned for all of them
+        names = [song.safe_filename for song in songs]
+        unique: Dict[str, Song] = {}
+        for name, song in zip(names, songs):
+            unique.setdefault(name, song)
+        paths = await asyncio.gather(*(download(song) for song in unique.values()))
+        results = dict(zip(unique, paths))
+        return [results[name] for name in names]
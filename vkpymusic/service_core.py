@@ -0,0 +1,418 @@
+"""
+This module contains the base class '_ServiceCore' with logic shared
+by 'Service' and 'ServiceAsync'.
+"""
+
+import os
+import functools
+import logging
+from abc import ABC, abstractmethod
+from json import dumps
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+
+from .models import Song, Playlist
+from .utils import _token_cache
+from .utils._jsonfast import loads
+
+
+Params = List[Tuple[str, Union[str, int]]]
+# Type of items (songs, playlists) returned by list methods
+T = TypeVar("T")
+# List of (VK API method, params) for 'execute'
+Calls = List[Tuple[str, Dict[str, Union[str, int]]]]
+
+# Max count of API calls in one 'execute' request
+EXECUTE_LIMIT = 25
+# Size of chunks for saving music
+CHUNK_SIZE = 64 * 1024
+
+
+# Folder of package, where configs are saved by 'TokenReceiver'
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _parse_vk_section(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Simple parser for config saved by 'TokenReceiver' ('key=value' lines under '[VK]').
+
+    Args:
+        text (str): Text of config.
+
+    Returns:
+        Optional[Tuple[str, str]]: User agent and token or None if config has other format.
+    """
+    section = None
+    values: Dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[":
+            if line[-1] != "]":
+                return None
+            section = line[1:-1]
+            continue
+        key, sep, value = line.partition("=")
+        if not sep:
+            return None
+        if section == "VK":
+            values[key.strip().lower()] = value.strip()
+    if "user_agent" not in values or "token_for_audio" not in values:
+        return None
+    return values["user_agent"], values["token_for_audio"]
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config(path: str, mtime: float) -> Tuple[str, str]:
+    """
+    Read user agent and token from config (result is cached by path and
+    modification time, so changed config is read again).
+
+    Args:
+        path (str):    Path to config.
+        mtime (float): Modification time of config.
+
+    Returns:
+        Tuple[str, str]: User agent and token.
+    """
+    with open(path, encoding="utf-8") as config_file:
+        text = config_file.read()
+    result = _parse_vk_section(text)
+    if result is not None:
+        return result
+    # Config was edited manually, so use full parser
+    import configparser
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_string(text, source=path)
+    return config["VK"]["user_agent"], config["VK"]["token_for_audio"]
+
+
+class _ServiceCore(ABC):
+    """
+    Base class for 'Service' and 'ServiceAsync'.
+
+    Contains config parsing, request building and helpers for saving music.
+    Subclasses implement '_request' (for VK API methods like 'audio.get'),
+    '_get_profile_info' and 'check_token' with their HTTP client; the private request
+    methods here return whatever '_request' returns (a response or an
+    awaitable of the response).
+
+    Attributes:
+        user_agent (str): User agent string.
+        logger (logging.Logger): The logger for class.
+    """
+    logger: logging.Logger
+    _METHOD_URL = "https://api.vk.com/method/"
+    _PROFILE_INFO_URL = _METHOD_URL + "account.getProfileInfo"
+    # Default folder for saved music, resolved on first save
+    _music_dir: Optional[str] = None
+
+    #############
+    # CONSTRUCTOR
+    def __init__(
+            self,
+            user_agent: str,
+            token: str
+    ) -> None:
+        """
+        Initializes a service object.
+
+        Args:
+            user_agent (str): User agent string.
+            token (str):      Token for VK API.
+        """
+        self.user_agent = user_agent
+        # Params sent with every request, built once
+        self.__params = self._base_params(token)
+
+    @classmethod
+    def set_logger(cls, logger: logging.Logger) -> None:
+        """
+        Set logger for class.
+
+        Args:
+            logger (logging.Logger): Logger.
+        """
+        cls.logger = logger
+
+    ##################################
+    # METHODS WITH WORKING WITH CONFIG
+    @classmethod
+    def parse_config(cls, filename: str = "config_vk.ini"):
+        """
+        Create an instance of service from config.
+
+        Args:
+            filename (str): Filename of config (default = "config_vk.ini").
+        """
+        configfile_path = os.path.join(_MODULE_DIR, filename)
+        if not os.path.isfile(configfile_path):
+            cls.logger.error(f"Config not found: {configfile_path}")
+            return
+        try:
+            mtime = os.stat(configfile_path).st_mtime
+            user_agent, token = _read_config(configfile_path, mtime)
+        except Exception as e:
+            cls.logger.error(f"Config is invalid: {e!r}")
+            return
+        return cls(user_agent, token)
+
+    @classmethod
+    def del_config(cls, filename: str = "config_vk.ini"):
+        """
+        Delete config created by 'TokenReceiver'.
+
+        Args:
+            filename (str): Filename of config (default value = "config_vk.ini").
+        """
+        configfile_path = os.path.join(_MODULE_DIR, filename)
+        try:
+            os.remove(configfile_path)
+            _read_config.cache_clear()
+            cls.logger.info("Config successful deleted!")
+        except Exception as e:
+            cls.logger.warning(e)
+
+    ##############################################
+    # METHODS FOR WORKING WITH TOKEN AND USER INFO
+    @staticmethod
+    def _base_params(token: str) -> Tuple[Tuple[str, Union[str, int]], ...]:
+        return (
+            ("access_token", token),
+            ("https", 1),
+            ("lang", "ru"),
+            ("extended", 1),
+            ("v", "5.131"),
+        )
+
+    def _own_token(self) -> str:
+        # Token is kept only in params sent with every request
+        return self.__params[0][1]
+
+    def _get_own_profile_info(self) -> Any:
+        return self._request("account.getProfileInfo", [])
+
+    @classmethod
+    def _is_valid_profile_response(cls, content: bytes, token: str) -> bool:
+        """
+        Check response of 'account.getProfileInfo'. Invalid token is removed
+        from cache of tokens received by 'TokenReceiver'.
+
+        Args:
+            content (bytes): Content of response.
+            token (str):     Checked token.
+
+        Returns:
+            bool: True if token is valid, False otherwise.
+        """
+        data = loads(content)
+        if "error" in data:
+            cls.logger.error("Token is invalid!")
+            _token_cache.discard(token)
+            return False
+        cls.logger.info("Token is valid!")
+        return True
+
+    @staticmethod
+    def _parse_count(content: bytes) -> int:
+        data = loads(content)
+        return int(data["response"])
+
+    @classmethod
+    def _log_results(cls, items: List[Any]) -> None:
+        """
+        Log found songs/playlists in one message (skipped if INFO is disabled).
+
+        Args:
+            items (List[Any]): Songs or playlists.
+        """
+        if not cls.logger.isEnabledFor(logging.INFO):
+            return
+        if len(items) == 0:
+            cls.logger.info("No results found ._.")
+            return
+        cls.logger.info(
+            "Results:\n%s",
+            "\n".join(f"{i}) {item}" for i, item in enumerate(items, start=1)),
+        )
+
+    #######################################
+    # PRIVATE METHODS FOR CREATING REQUESTS
+
+    def _headers(self) -> Dict[str, str]:
+        # Accept-Encoding is left to HTTP client (it lists all encodings it can decode)
+        return {"User-Agent": self.user_agent}
+
+    # Main method for creating requests (headers are set in session/client)
+    def _build_request(self, method: str, params: Params) -> Tuple[str, Params]:
+        url = self._METHOD_URL + method
+        parameters = [*self.__params, *params]
+        return url, parameters
+
+    @abstractmethod
+    def _request(self, method: str, params: Params) -> Any:
+        ...
+
+    def _execute(self, calls: Calls) -> Any:
+        """
+        Run up to 25 API calls in one request with VK method 'execute'.
+        Response contains array with results of calls (False for failed ones).
+
+        Args:
+            calls (Calls): List of (method, params), e.g. ("audio.get", {"owner_id": 1}).
+        """
+        code = "return [" + ",".join(
+            f"API.{method}({dumps(params, ensure_ascii=False)})"
+            for method, params in calls
+        ) + "];"
+        return self._request("execute", [("code", code)])
+
+    # Other methods
+    def _get_count(self, user_id: int) -> Any:
+        params = [("owner_id", user_id)]
+        return self._request("audio.getCount", params)
+
+    def _get(
+        self,
+        user_id: int,
+        count: int = 100,
+        offset: int = 0,
+        playlist_id: Optional[int] = None,
+        access_key: Optional[str] = None,
+    ) -> Any:
+        params = [
+            ("owner_id", user_id),
+            ("count", count),
+            ("offset", offset),
+            *((("album_id", playlist_id), ("access_key", access_key)) if playlist_id else ()),
+        ]
+        return self._request("audio.get", params)
+
+    @staticmethod
+    def _playlist_call(
+        playlist: Playlist, count: int = 100, offset: int = 0
+    ) -> Tuple[str, Dict[str, Union[str, int]]]:
+        params = {
+            "owner_id": playlist.owner_id,
+            "count": count,
+            "offset": offset,
+            "album_id": playlist.playlist_id,
+        }
+        if playlist.access_key:
+            params["access_key"] = playlist.access_key
+        return "audio.get", params
+
+    def _search(self, text: str, count: int = 100, offset: int = 0) -> Any:
+        params = [
+            ("q", text),
+            ("count", count),
+            ("offset", offset),
+            ("sort", 0),
+            ("autocomplete", 1),
+        ]
+        return self._request("audio.search", params)
+
+    def _get_playlists(self, user_id: int, count: int = 50, offset: int = 0) -> Any:
+        params = [
+            ("owner_id", user_id),
+            ("count", count),
+            ("offset", offset),
+        ]
+        return self._request("audio.getPlaylists", params)
+
+    def _search_playlists(self, text: str, count: int = 50, offset: int = 0) -> Any:
+        params = [
+            ("q", text),
+            ("count", count),
+            ("offset", offset),
+        ]
+        return self._request("audio.searchPlaylists", params)
+
+    def _search_albums(self, text: str, count: int = 50, offset: int = 0) -> Any:
+        params = [
+            ("q", text),
+            ("count", count),
+            ("offset", offset),
+        ]
+        return self._request("audio.searchAlbums", params)
+
+    def _get_popular(self, count: int = 500, offset: int = 0) -> Any:
+        params = [
+            ("count", count),
+            ("offset", offset),
+        ]
+        return self._request("audio.getPopular", params)
+
+    def _get_recommendations(
+            self,
+            user_id: Optional[int] = None,
+            song_id: Optional[int] = None,
+            count: int = 300,
+            offset: int = 0
+    ) -> Any:
+        params = [
+            ("count", count),
+            ("offset", offset),
+            *((("user_id", user_id),) if user_id else ()),
+            *((("target_id", song_id),) if song_id else ()),
+        ]
+        return self._request("audio.getRecommendations", params)
+
+    ################################
+    # PRIVATE METHODS FOR SAVING MUSIC
+    @classmethod
+    def _ensure_music_dir(cls, music_dir: Optional[str] = None) -> str:
+        """
+        Get folder for saving music and create it if it doesn't exist.
+
+        Args:
+            music_dir (Optional[str]): Folder for music. If None, '{workDirectory}/Music'
+                is used (work directory is resolved once, on first call).
+
+        Returns:
+            str: Path of folder for music.
+        """
+        if music_dir is None:
+            if cls._music_dir is None:
+                cls._music_dir = os.path.join(os.getcwd(), "Music")
+            music_dir = cls._music_dir
+        if not os.path.isdir(music_dir):
+            os.makedirs(music_dir, exist_ok=True)
+            cls.logger.info(f"Folder '{music_dir}' was created")
+        return music_dir
+
+    @classmethod
+    def _get_file_path(cls, song: Song, music_dir: Optional[str] = None) -> Optional[str]:
+        """
+        Check url of song and get path for saving it.
+
+        Args:
+            song (Song): 'Song' instance obtained from service methods.
+            music_dir (Optional[str]): Folder for music (default = '{workDirectory}/Music').
+
+        Returns:
+            Optional[str]: Path for saving song or None if song can't be saved.
+        """
+        if not song.url:
+            cls.logger.warning("Url no found")
+            return
+        if "index.m3u8" in song.url:
+            cls.logger.error(".m3u8 detected!")
+            return
+        return os.path.join(cls._ensure_music_dir(music_dir), song.safe_filename)
+
+    @staticmethod
+    def _is_up_to_date(file_path: str, headers: Any) -> bool:
+        """
+        Compare size of saved file with 'Content-Length' of remote one.
+
+        Args:
+            file_path (str): Path of saved file.
+            headers (Any):   Headers of response to HEAD request.
+
+        Returns:
+            bool: True if sizes are equal, False otherwise.
+        """
+        content_length = int(headers.get("content-length", -1))
+        return content_length == os.path.getsize(file_path)
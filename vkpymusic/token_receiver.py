@@ -4,16 +4,20 @@ for performing authorization using the available login and password.
 It interacts with the VK API to obtain an access token.
 """
 
-import os
-import json
 import logging
-from typing import Callable, Tuple, Union, Optional
+import webbrowser
+from typing import Any, Callable, Dict, Tuple, Union, Optional
 
 import requests
 from requests import Session, Response
+from requests.adapters import HTTPAdapter
 
-from .client import clients
-from .utils import create_logger
+from .token_receiver_core import _TokenReceiverCore
+from .utils import create_logger, with_retry
+
+
+# Timeout of requests to VK (in seconds), so auth doesn't hang forever
+_TIMEOUT = 10
 
 
 def on_captcha_handler(url: str) -> str:
@@ -26,7 +30,12 @@ def on_captcha_handler(url: str) -> str:
     Returns:
         str: Key/decoded captcha.
     """
-    os.system(url)
+    # Open image in browser (without shell, so url can't inject commands);
+    # url is shown anyway, as there may be no browser (e.g. over SSH)
+    logger = logging.getLogger(__name__)
+    logger.info("Captcha image: %s", url)
+    if not webbrowser.open(url, new=2):
+        logger.warning("Browser wasn't opened, open url manually")
     captcha_key: str = input("Captcha: ")
     return captcha_key
 
@@ -59,7 +68,7 @@ def on_critical_error_handler(response_auth_json):
     pass
 
 
-class TokenReceiver:
+class TokenReceiver(_TokenReceiverCore):
     """
     A class that is responsible for performing authorization using
     the available login and password. It interacts with the VK API
@@ -69,17 +78,16 @@ class TokenReceiver:
 
     Attributes:
         client (Client): The client object.
-        __login (str): The login.
-        __password (str): The password.
+        __auth_params (tuple): Params for auth request (with login and password).
         __token (str): The token.
         _logger (logging.Logger): The logger.
 
     Example usage:
     ```
-    >>> receiver = TokenReceiver(login="my_username", password="my_password")
-    >>> if receiver.auth():
-    ...    receiver.get_token()
-    ...    receiver.save_to_config()
+    >>> with TokenReceiver(login="my_username", password="my_password") as receiver:
+    ...     if receiver.auth():
+    ...         receiver.get_token()
+    ...         receiver.save_to_config()
     ```
     """
 
@@ -99,15 +107,27 @@ class TokenReceiver:
             client (str): Client to VK (default value = "Kate").
             logger (logging.Logger): Logger (default value = my logger).
         """
-        self.__login: str = str(login)
-        self.__password: str = str(password)
-        if client in clients:
-            self.client = clients[client]
-        else:
-            self.client = clients["Kate"]
-        self.__token = None
-        self._logger = logger
+        super().__init__(login, password, client, logger)
+        # One session for all requests, so connection is reused between
+        # captcha/2FA retries
+        self._session = Session()
+        self._session.headers.update(self.client.headers)
+        # Auth uses only two hosts (oauth.vk.com and api.vk.com)
+        self._session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+    def close(self) -> None:
+        """
+        Close session of receiver.
+        """
+        self._session.close()
 
+    def __enter__(self) -> "TokenReceiver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @with_retry(exceptions=(requests.ConnectionError, requests.Timeout))
     def request_auth(
         self, code: Optional[str] = None, captcha: Optional[Tuple[str, str]] = None
     ) -> Response:
@@ -121,28 +141,26 @@ class TokenReceiver:
         Returns:
             Response: Response from VK.
         """
-        query_params = [
-            ("grant_type", "password"),
-            ("client_id", self.client.client_id),
-            ("client_secret", self.client.client_secret),
-            ("username", self.__login),
-            ("password", self.__password),
-            ("scope", "audio,offline"),
-            ("2fa_supported", 1),
-            ("force_sms", 1),
-            ("v", 5.131),
-        ]
-        if captcha:
-            query_params.append(("captcha_sid", captcha[0]))
-            query_params.append(("captcha_key", captcha[1]))
-        if code:
-            query_params.append(("code", code))
-        with Session() as session:
-            session.headers.update({"User-Agent": self.client.user_agent})
-            response = session.post("https://oauth.vk.com/token", data=query_params)
+        query_params = self._auth_query(code, captcha)
+        response = self._session.post(
+            "https://oauth.vk.com/token", data=query_params, timeout=_TIMEOUT
+        )
         return response
 
-    def request_code(self, sid: Union[str, int]) -> Response:
+    @with_retry(
+        exceptions=(requests.ConnectionError, requests.Timeout),
+        retry_if=_TokenReceiverCore._is_rate_limited,
+    )
+    def _validate_phone(self, sid: Union[str, int]) -> Response:
+        query_params = [("sid", str(sid)), ("v", "5.131")]
+        return self._session.post(
+            "https://api.vk.com/method/auth.validatePhone",
+            data=query_params,
+            allow_redirects=True,
+            timeout=_TIMEOUT,
+        )
+
+    def request_code(self, sid: Union[str, int]) -> dict:
         """
         Request code from VK.
 
@@ -150,17 +168,11 @@ class TokenReceiver:
             sid (Union[str, int]): Sid from VK.
 
         Returns:
-            Response: Response from VK.
+            dict: Parsed response from VK (empty if it isn't JSON).
         """
-        query_params = [("sid", str(sid)), ("v", "5.131")]
-        with Session() as session:
-            session.headers.update({"User-Agent": self.client.user_agent})
-            response = session.post(
-                "https://api.vk.com/method/auth.validatePhone",
-                data=query_params,
-                allow_redirects=True,
-            )
-        response_json = json.loads(response.content.decode("utf-8"))
+        # Request is repeated on errors of connection, 429/5xx and VK errors 6/9,
+        # body is parsed after last attempt
+        response_json = self._parse_code_response(self._validate_phone(sid))
         # right_response_json = {
         #     "response": {
         #         "type": "general",
@@ -173,12 +185,22 @@ class TokenReceiver:
         # }
         return response_json
 
+    def _auth_request(
+        self, arg: Tuple[Optional[str], Optional[Tuple[str, str]]]
+    ) -> dict:
+        return self._parse(self.request_auth(*arg))
+
+    def _code_request(self, sid: Union[str, int], on_2fa: Callable[[], str]) -> str:
+        self.request_code(sid)
+        return on_2fa()
+
     def auth(
         self,
         on_captcha: Callable[[str], str] = on_captcha_handler,
         on_2fa: Callable[[], str] = on_2fa_handler,
         on_invalid_client: Callable[[], None] = on_invalid_client_handler,
         on_critical_error: Callable[..., None] = on_critical_error_handler,
+        use_cache: bool = True,
     ) -> bool:
         """
         Performs authorization using the available login and password.
@@ -189,119 +211,28 @@ class TokenReceiver:
             on_2fa (Callable[[], str]): Handler to 2-factor auth. Return captcha.
             on_invalid_client (Callable[[], None]): Handler to invalid client.
             on_critical_error (Callable[[Any], None]): Handler to critical error. Get response.
+            use_cache (bool): Take token from cache of received tokens if it's there
+                (default value = True).
 
         Returns:
             bool: Boolean value indicating whether authorization was successful or not.
         """
-        response_auth: requests.Response = self.request_auth()
-        response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-        while "error" in response_auth_json:
-            error = response_auth_json["error"]
-            error_type = response_auth_json.get("error_type", "")
-            if error == "need_captcha":
-                self._logger.info("Captcha is needed!")
-                captcha_sid: str = response_auth_json["captcha_sid"]
-                captcha_img: str = response_auth_json["captcha_img"]
-                captcha_key: str = on_captcha(captcha_img)
-                response_auth = self.request_auth(captcha=(captcha_sid, captcha_key))
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "need_validation":
-                self._logger.info("2fa is needed!")
-                validation_type = response_auth_json["validation_type"]
-                validation_description = response_auth_json["error_description"]
-                if validation_type == "2fa_app":
-                    self._logger.info("Code from 2FA app is needed!")
-                else:
-                    self._logger.info(validation_description)
-                sid = response_auth_json["validation_sid"]
-                self.request_code(sid)
-                code: str = on_2fa()
-                response_auth = self.request_auth(code=code)
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "invalid_request":
-                self._logger.warning("Invalid code. Try again!")
-                code: str = on_2fa()
-                response_auth = self.request_auth(code=code)
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "invalid_client":
-                self._logger.error("Login or password is invalid!")
-                del self.__login
-                del self.__password
-                on_invalid_client()
-                return False
-            elif error_type == "password_bruteforce_attempt":
-                self._logger.error("Password bruteforce attempt!")
-                del self.__login
-                del self.__password
-                return False
-            else:
-                del self.__login
-                del self.__password
-                on_critical_error(response_auth_json)
-                self.__on_error(response_auth_json)
-                return False
-        if "access_token" in response_auth_json:
-            del self.__login
-            del self.__password
-            access_token = response_auth_json["access_token"]
-            self._logger.info("Token was received!")
-            self.__token = access_token
-            return True
-        del self.__login
-        del self.__password
-        self.__on_error(response_auth_json)
-        on_critical_error(response_auth_json)
-        return False
-
-    def get_token(self) -> Optional[str]:
-        """
-        Prints token in console (if authorisation was successful).
-        """
-        token = self.__token
-        if not token:
-            self._logger.warning('Please, first call the method "auth".')
-            return
-        self._logger.info(token)
-        return token
-
-    def save_to_config(self, file_path: str = "config_vk.ini"):
-        """
-        Save token and user agent data in config (if authorisation was successful).
-
-        Args:
-            file_path (str): Filename of config (default value = "config_vk.ini").
-        """
-        token: str = self.__token
-        if not token:
-            self._logger.warning('Please, first call the method "auth"')
-            return
-        full_fp = self.create_path(file_path)
-        if os.path.isfile(full_fp):
-            self._logger.info('File already exist! Enter "OK" for rewriting it')
-            if input().lower() != "ok":
-                return
-        os.makedirs(os.path.dirname(full_fp), exist_ok=True)
-        with open(full_fp, "w") as output_file:
-            output_file.write("[VK]\n")
-            output_file.write(f"user_agent={self.client.user_agent}\n")
-            output_file.write(f"token_for_audio={token}")
-            self._logger.info("Token was saved!")
-
-    def __on_error(self, response):
-        self._logger.critical(
-            "Unexpected error! Please, create an issue in repository for solving this problem."
-        )
-        self._logger.critical(response)
-
-    @staticmethod
-    def create_path(file_path: str) -> str:
-        """
-        Create path before and after this for different funcs.
-
-        Args:
-            file_path (str): Relative path to file.
-
-        Returns:
-            str: Absolute path to file.
-        """
-        return os.path.join(os.path.dirname(__file__), file_path)
+        # Performers of steps of '_auth_steps' by action (each gets argument of step)
+        actions: Dict[str, Callable[[Any], Any]] = {
+            "request_auth": self._auth_request,
+            "request_code_and_2fa": lambda sid: self._code_request(sid, on_2fa),
+            "captcha": on_captcha,
+            "2fa": lambda _: on_2fa(),
+            "invalid_client": lambda _: on_invalid_client(),
+            "critical_error": on_critical_error,
+        }
+        steps = self._auth_steps(use_cache)
+        result = None
+        try:
+            while True:
+                action, arg = steps.send(result)
+                result = actions[action](arg)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            steps.close()
@@ -5,17 +5,47 @@ It interacts with the VK API to obtain an access token.
 """
 
 import os
-import json
+import asyncio
 import logging
-from typing import Awaitable, Callable, Union, Tuple, Optional
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, Union, Tuple, Optional
 
-from httpx import AsyncClient, Response
+import aiofiles
+from httpx import AsyncClient, Limits, Response, TransportError
 
-from .client import clients
-from .utils import create_logger
+from .token_receiver_core import _TokenReceiverCore, _DEFAULT_CLIENT
+from .utils import create_logger, with_retry
+from .utils._http2 import HTTP2
 
 
-class TokenReceiverAsync:
+async def on_captcha_handler_async(url: str) -> str:
+    """
+    Handler to captcha for 'TokenReceiverAsync.auth': saves captcha image
+    to temp folder and asks key in console (without blocking event loop).
+
+    Args:
+        url (str): Url to captcha image.
+
+    Returns:
+        str: Key/decoded captcha.
+    """
+    logger = logging.getLogger(__name__)
+    async with AsyncClient(headers=_DEFAULT_CLIENT.headers) as session:
+        response = await session.get(url, follow_redirects=True)
+    if response.status_code != 200:
+        logger.error("Captcha image wasn't loaded (%s): %s", response.status_code, url)
+    else:
+        # Unique file created only by us (not following planted symlinks)
+        fd, file_path = tempfile.mkstemp(prefix="vk_captcha_", suffix=".jpg")
+        async with aiofiles.open(fd, "wb") as output_file:
+            await output_file.write(response.content)
+        logger.info("Captcha image: %s", file_path)
+    loop = asyncio.get_running_loop()
+    captcha_key: str = await loop.run_in_executor(None, input, "Captcha: ")
+    return captcha_key
+
+
+class TokenReceiverAsync(_TokenReceiverCore):
     """
     A class that is responsible for performing authorization using
     the available login and password. It interacts with the VK API
@@ -23,12 +53,12 @@ class TokenReceiverAsync:
     WARNING!!! The TokenReceiverAsync class DOESN'T provide
     methods for handling captcha, 2-factor authentication,
     and various error scenarios. You need to implement them
-    yourself using the appropriate handlers.
+    yourself using the appropriate handlers (for captcha in console
+    'on_captcha_handler_async' can be used).
 
     Attributes:
         client (Client): The client object.
-        __login (str): The login.
-        __password (str): The password.
+        __auth_params (tuple): Params for auth request (with login and password).
         __token (str): The token.
         _logger (logging.Logger): The logger.
 
@@ -37,10 +67,13 @@ class TokenReceiverAsync:
     >>> import asyncio
     >>> from vkpymusic import TokenReceiverAsync
     >>>
-    >>> receiver = TokenReceiverAsync(login="my_username", password="my_password")
-    >>> if asyncio.run(receiver.auth()):
-    ...     receiver.get_token()
-    ...     receiver.save_to_config()
+    >>> async def main():
+    ...     async with TokenReceiverAsync(login="my_username", password="my_password") as receiver:
+    ...         if await receiver.auth(on_captcha, on_2fa, on_invalid_client, on_critical_error):
+    ...             receiver.get_token()
+    ...             receiver.save_to_config()
+    >>>
+    >>> asyncio.run(main())
     ```
     """
 
@@ -60,15 +93,41 @@ class TokenReceiverAsync:
             client (str): Client to VK (default value = "Kate").
             logger (logging.Logger): Logger (default value = my logger).
         """
-        self.__login: str = str(login)
-        self.__password: str = str(password)
-        if client in clients:
-            self.client = clients[client]
-        else:
-            self.client = clients["Kate"]
-        self.__token = None
-        self._logger = logger
+        super().__init__(login, password, client, logger)
+        self._client: Optional[AsyncClient] = None
+
+    def _get_client(self) -> AsyncClient:
+        """
+        Get client of receiver, creating it on first use. One client is used
+        for all requests, so connection is reused between captcha/2FA retries.
+
+        Returns:
+            AsyncClient: Client for requests.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = AsyncClient(
+                http2=HTTP2,
+                headers=self.client.headers,
+                limits=Limits(max_keepalive_connections=4, max_connections=8),
+                timeout=30.0,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Close client of receiver.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "TokenReceiverAsync":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
 
+    @with_retry(exceptions=(TransportError,))
     async def request_auth(
         self, code: str = None, captcha: Tuple[str, str] = None
     ) -> Response:
@@ -82,30 +141,24 @@ class TokenReceiverAsync:
         Returns:
             Response: Response from VK.
         """
-        query_params = [
-            ("grant_type", "password"),
-            ("client_id", self.client.client_id),
-            ("client_secret", self.client.client_secret),
-            ("username", self.__login),
-            ("password", self.__password),
-            ("scope", "audio,offline"),
-            ("2fa_supported", 1),
-            ("force_sms", 1),
-            ("v", 5.131),
-        ]
-        if captcha:
-            query_params.append(("captcha_sid", captcha[0]))
-            query_params.append(("captcha_key", captcha[1]))
-        if code:
-            query_params.append(("code", code))
-        async with AsyncClient() as session:
-            session.headers.update({"User-Agent": self.client.user_agent})
-            response = await session.post(
-                "https://oauth.vk.com/token", params=query_params
-            )
+        query_params = self._auth_query(code, captcha)
+        response = await self._get_client().post(
+            "https://oauth.vk.com/token", params=query_params
+        )
         return response
 
-    async def request_code(self, sid: Union[str, int]) -> Response:
+    @with_retry(
+        exceptions=(TransportError,), retry_if=_TokenReceiverCore._is_rate_limited
+    )
+    async def _validate_phone(self, sid: Union[str, int]) -> Response:
+        query_params = [("sid", str(sid)), ("v", "5.131")]
+        return await self._get_client().post(
+            "https://api.vk.com/method/auth.validatePhone",
+            params=query_params,
+            follow_redirects=True,
+        )
+
+    async def request_code(self, sid: Union[str, int]) -> dict:
         """
         Request code from VK.
 
@@ -113,17 +166,11 @@ class TokenReceiverAsync:
             sid (Union[str, int]): Sid from VK.
 
         Returns:
-            Response: Response from VK.
+            dict: Parsed response from VK (empty if it isn't JSON).
         """
-        query_params = [("sid", str(sid)), ("v", "5.131")]
-        async with AsyncClient() as session:
-            session.headers.update({"User-Agent": self.client.user_agent})
-            response = await session.post(
-                "https://api.vk.com/method/auth.validatePhone",
-                params=query_params,
-                follow_redirects=True,
-            )
-        response_json = json.loads(response.content.decode("utf-8"))
+        # Request is repeated on errors of connection, 429/5xx and VK errors 6/9,
+        # body is parsed after last attempt
+        response_json = self._parse_code_response(await self._validate_phone(sid))
         # right_response_json = {
         #     "response": {
         #         "type": "general",
@@ -136,12 +183,31 @@ class TokenReceiverAsync:
         # }
         return response_json
 
+    async def _auth_request(
+        self, arg: Tuple[Optional[str], Optional[Tuple[str, str]]]
+    ) -> dict:
+        return self._parse(await self.request_auth(*arg))
+
+    async def _code_request(
+        self, sid: Union[str, int], on_2fa: Callable[[], Awaitable[str]]
+    ) -> str:
+        # User can enter code while request for sending it is in progress
+        code_task = asyncio.ensure_future(on_2fa())
+        try:
+            await self.request_code(sid)
+        except BaseException:
+            # Don't leave user waiting for code that won't be used
+            code_task.cancel()
+            raise
+        return await code_task
+
     async def auth(
         self,
         on_captcha: Callable[[str], Awaitable[str]],
         on_2fa: Callable[[], Awaitable[str]],
         on_invalid_client: Callable[[], Awaitable[None]],
         on_critical_error: Callable[..., Awaitable[None]],
+        use_cache: bool = True,
     ) -> bool:
         """
         Performs ASYNC authorization using the available login and password.
@@ -152,121 +218,54 @@ class TokenReceiverAsync:
             on_2fa (Callable[[], str]): ASYNC handler to 2-factor auth. Return captcha.
             on_invalid_client (Callable[[], None]): ASYNC handler to invalid client.
             on_critical_error (Callable[[Any], None]): ASYNC handler to crit error. Get response.
+            use_cache (bool): Take token from cache of received tokens if it's there
+                (default value = True).
 
         Returns:
             bool: Boolean value indicating whether authorization was successful or not.
         """
-        response_auth = await self.request_auth()
-        response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-        while "error" in response_auth_json:
-            error = response_auth_json["error"]
-            error_type = response_auth_json.get("error_type", "")
-            if error == "need_captcha":
-                self._logger.info("Captcha is needed!")
-                captcha_sid: str = response_auth_json["captcha_sid"]
-                captcha_img: str = response_auth_json["captcha_img"]
-                captcha_key: str = await on_captcha(captcha_img)
-                response_auth = await self.request_auth(
-                    captcha=(captcha_sid, captcha_key)
-                )
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "need_validation":
-                self._logger.info("2FA is needed!")
-                validation_type = response_auth_json["validation_type"]
-                validation_description = response_auth_json["error_description"]
-                if validation_type == "2fa_app":
-                    self._logger.info("Code from 2FA app is needed!")
-                else:
-                    self._logger.info(validation_description)
-                sid = response_auth_json["validation_sid"]
-                await self.request_code(sid)
-                code: str = await on_2fa()
-                response_auth = await self.request_auth(code=code)
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "invalid_request":
-                self._logger.warning("Invalid code. Try again!")
-                code: str = await on_2fa()
-                response_auth = await self.request_auth(code=code)
-                response_auth_json = json.loads(response_auth.content.decode("utf-8"))
-            elif error == "invalid_client":
-                self._logger.error("Login or password is invalid!")
-                del self.__login
-                del self.__password
-                await on_invalid_client()
-                return False
-            elif error_type == "password_bruteforce_attempt":
-                self._logger.error("Password bruteforce attempt!")
-                del self.__login
-                del self.__password
-                return False
-            else:
-                del self.__login
-                del self.__password
-                await on_critical_error(response_auth_json)
-                self.__on_error(response_auth_json)
-                return False
-        if "access_token" in response_auth_json:
-            del self.__login
-            del self.__password
-            access_token = response_auth_json["access_token"]
-            self._logger.info("Token was received!")
-            self.__token = access_token
-            return True
-        del self.__login
-        del self.__password
-        self.__on_error(response_auth_json)
-        await on_critical_error(response_auth_json)
-        return False
-
-    def get_token(self) -> Optional[str]:
-        """
-        Prints token in console (if authorisation was successful).
-        """
-        token = self.__token
-        if not token:
-            self._logger.warning('Please, first call the method "auth".')
-            return
-        self._logger.info(token)
-        return token
+        # Performers of steps of '_auth_steps' by action (each gets argument
+        # of step and returns awaitable)
+        actions: Dict[str, Callable[[Any], Awaitable[Any]]] = {
+            "request_auth": self._auth_request,
+            "request_code_and_2fa": lambda sid: self._code_request(sid, on_2fa),
+            "captcha": on_captcha,
+            "2fa": lambda _: on_2fa(),
+            "invalid_client": lambda _: on_invalid_client(),
+            "critical_error": on_critical_error,
+        }
+        steps = self._auth_steps(use_cache)
+        result = None
+        try:
+            while True:
+                action, arg = steps.send(result)
+                result = await actions[action](arg)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            steps.close()
 
-    def save_to_config(self, file_path: str = "config_vk.ini"):
+    async def save_to_config_async(self, file_path: str = "config_vk.ini"):
         """
-        Save token and user agent data in config (if authorisation was succesful).
+        Save token and user agent data in config (if authorisation was succesful)
+        without blocking event loop.
 
         Args:
             file_path (str): Filename of config (default value = "config_vk.ini").
         """
-        token: str = self.__token
-        if not token:
-            self._logger.warning('Please, first call the method "auth"')
+        config_text = self._config_text()
+        if config_text is None:
             return
         full_fp = self.create_path(file_path)
         if os.path.isfile(full_fp):
-            print('File already exist! Enter "OK" for rewriting it')
-            if input().lower() != "ok":
+            self._logger.info('File already exist! Enter "OK" for rewriting it')
+            loop = asyncio.get_running_loop()
+            if (await loop.run_in_executor(None, input)).lower() != "ok":
                 return
         os.makedirs(os.path.dirname(full_fp), exist_ok=True)
-        with open(full_fp, "w") as output_file:
-            output_file.write("[VK]\n")
-            output_file.write(f"user_agent={self.client.user_agent}\n")
-            output_file.write(f"token_for_audio={token}")
-            self._logger.info("Token was saved!")
-
-    def __on_error(self, response):
-        self._logger.critical(
-            "Unexpected error! Please, create an issue in repository for solving this problem."
-        )
-        self._logger.critical(response)
-
-    @staticmethod
-    def create_path(file_path: str) -> str:
-        """
-        Create path before and after this for different funcs.
-
-        Args:
-            file_path (str): Relative path to file.
-
-        Returns:
-            str: Absolute path to file.
-        """
-        return os.path.join(os.path.dirname(__file__), file_path)
+        # Token is readable only by owner of file
+        async with aiofiles.open(
+            full_fp, "w", opener=lambda path, flags: os.open(path, flags, 0o600)
+        ) as output_file:
+            await output_file.write(config_text)
+        self._logger.info("Token was saved!")
@@ -0,0 +1,388 @@
+"""
+This module contains the base class '_TokenReceiverCore' with logic shared
+by 'TokenReceiver' and 'TokenReceiverAsync'.
+"""
+
+import io
+import os
+import logging
+from enum import IntEnum
+from typing import Any, Callable, Dict, Generator, Optional, Tuple, Union
+
+from .client import clients
+from .utils import _token_cache
+from .utils._jsonfast import loads
+
+
+class _AuthError(IntEnum):
+    """
+    Kinds of errors in response of auth.
+    """
+
+    UNKNOWN = 0
+    NEED_CAPTCHA = 1
+    NEED_VALIDATION = 2
+    INVALID_REQUEST = 3
+    INVALID_CLIENT = 4
+    PASSWORD_BRUTEFORCE_ATTEMPT = 5
+
+
+# Kinds of errors by "error" or "error_type" of response
+_AUTH_ERRORS: Dict[str, _AuthError] = {
+    "need_captcha": _AuthError.NEED_CAPTCHA,
+    "need_validation": _AuthError.NEED_VALIDATION,
+    "invalid_request": _AuthError.INVALID_REQUEST,
+    "invalid_client": _AuthError.INVALID_CLIENT,
+    "password_bruteforce_attempt": _AuthError.PASSWORD_BRUTEFORCE_ATTEMPT,
+}
+
+
+# Codes of VK API errors "Too many requests per second" and "Flood control"
+# (sent with status 200), after which request can be repeated
+_RATE_LIMIT_CODES = frozenset((6, 9))
+
+# Login and password are wiped after first auth (successful or not)
+_CREDS_USED = "Credentials were already used for auth, create a new receiver!"
+
+# Client used if unknown one is passed
+_DEFAULT_CLIENT = clients["Kate"]
+
+# Folder of package, where configs are saved
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Step of auth for driver of 'auth': (action, argument)
+Step = Tuple[str, Any]
+# Handler of auth error (called with receiver and response): yields steps,
+# returns new response of auth or None
+_ErrorHandler = Callable[[Any, dict], Generator[Step, Any, Optional[dict]]]
+
+
+class _TokenReceiverCore:
+    """
+    Base class for 'TokenReceiver' and 'TokenReceiverAsync'.
+
+    Auth logic is written once as generator '_auth_steps': it yields steps
+    (action, argument) and receives result of each step, so subclasses
+    only perform them (sync or async) in 'auth':
+
+        ("request_auth", (code, captcha)) -> parsed response of auth request
+        ("request_code_and_2fa", sid)     -> code (request of code + 'on_2fa')
+        ("captcha", url)                  -> key ('on_captcha')
+        ("2fa", None)                     -> code ('on_2fa')
+        ("invalid_client", None)          -> None ('on_invalid_client')
+        ("critical_error", response)      -> None ('on_critical_error')
+
+    Generator returns True if token was received, False otherwise.
+
+    Attributes:
+        client (Client): The client object.
+        __auth_params (Optional[tuple]): Params for auth request (with login
+            and password), None after auth.
+        __token (str): The token.
+        _logger (logging.Logger): The logger.
+    """
+    def __init__(
+            self,
+            login: str,
+            password: str,
+            client: str,
+            logger: logging.Logger
+    ) -> None:
+        """
+        Initialize receiver.
+
+        Args:
+            login (str): Login to VK.
+            password (str): Password to VK.
+            client (str): Client to VK.
+            logger (logging.Logger): Logger.
+        """
+        if type(login) is not str:
+            login = str(login)
+        if type(password) is not str:
+            password = str(password)
+        self.client = clients.get(client, _DEFAULT_CLIENT)
+        # Key for cache of tokens (HMAC, so login and password aren't kept in it)
+        self.__cache_key: bytes = _token_cache.make_key(
+            login, password, self.client.client_id
+        )
+        # Same for every auth request, only captcha and code are added
+        self.__auth_params: Optional[Tuple[Tuple[str, Union[str, int]], ...]] = (
+            ("grant_type", "password"),
+            ("client_id", self.client.client_id),
+            ("client_secret", self.client.client_secret),
+            ("username", login),
+            ("password", password),
+            ("scope", "audio,offline"),
+            ("2fa_supported", 1),
+            ("force_sms", 1),
+            ("v", 5.131),
+        )
+        self.__token = None
+        self._logger = logger
+
+    def _auth_query(
+        self, code: Optional[str] = None, captcha: Optional[Tuple[str, str]] = None
+    ) -> Tuple[Tuple[str, Union[str, int]], ...]:
+        query_params = self.__auth_params
+        if query_params is None:
+            self._logger.error(_CREDS_USED)
+            raise RuntimeError(_CREDS_USED)
+        if captcha:
+            query_params += (("captcha_sid", captcha[0]), ("captcha_key", captcha[1]))
+        if code:
+            query_params += (("code", code),)
+        return query_params
+
+    def _wipe_creds(self) -> None:
+        """
+        Drop params with login and password (they are needed only for auth).
+        Python strings can't be zeroed in place, so the only copy is released.
+        """
+        self.__auth_params = None
+
+    @staticmethod
+    def _parse(response: Any) -> dict:
+        """
+        Parse JSON body of response from VK.
+
+        Args:
+            response (Any): Response from VK.
+
+        Returns:
+            dict: Parsed body.
+        """
+        return loads(response.content)
+
+    @staticmethod
+    def _is_rate_limited(response: Any) -> bool:
+        """
+        Check if VK API answered with error "Too many requests" (6 or 9).
+
+        Args:
+            response (Any): Response from VK.
+
+        Returns:
+            bool: True if request can be repeated, False otherwise.
+        """
+        # Body is parsed only if it contains error
+        if response.status_code != 200 or b'"error_code"' not in response.content:
+            return False
+        try:
+            error = loads(response.content).get("error")
+        except ValueError:
+            return False
+        return isinstance(error, dict) and error.get("error_code") in _RATE_LIMIT_CODES
+
+    def _parse_code_response(self, response: Any) -> dict:
+        """
+        Parse response of 'auth.validatePhone' (code is sent by VK, so error
+        of this request is only logged).
+
+        Args:
+            response (Any): Response from VK.
+
+        Returns:
+            dict: Parsed body or empty dict if response isn't JSON.
+        """
+        try:
+            return self._parse(response)
+        except ValueError:
+            self._logger.error(
+                "Code wasn't requested (status %s)", response.status_code
+            )
+            return {}
+
+    @staticmethod
+    def _classify_error(response_auth_json: dict) -> _AuthError:
+        """
+        Get kind of error by "error" (or, if it's unknown, by "error_type") of response.
+
+        Args:
+            response_auth_json (dict): Response of auth with error.
+
+        Returns:
+            _AuthError: Kind of error.
+        """
+        kind = _AUTH_ERRORS.get(response_auth_json["error"])
+        if kind is None:
+            kind = _AUTH_ERRORS.get(
+                response_auth_json.get("error_type", ""), _AuthError.UNKNOWN
+            )
+        return kind
+
+    ###############
+    # STEPS OF AUTH
+    def _auth_steps(self, use_cache: bool = True) -> Generator[Step, Any, bool]:
+        # Login and password are dropped however auth ends (even on exception
+        # in driver, which closes generator)
+        try:
+            cached = _token_cache.get(self.__cache_key) if use_cache else None
+            if cached is not None:
+                self._logger.info("Token was taken from cache!")
+                self.__token = cached
+                return True
+            if self.__auth_params is None:
+                self._logger.error(_CREDS_USED)
+                return False
+            response_auth_json = yield "request_auth", (None, None)
+            while "error" in response_auth_json:
+                handler = self._HANDLERS[self._classify_error(response_auth_json)]
+                response_auth_json = yield from handler(self, response_auth_json)
+                if response_auth_json is None:
+                    return False
+            access_token = response_auth_json.get("access_token")
+            if access_token is not None:
+                self._logger.info("Token was received!")
+                self.__token = access_token
+                # Token with scope "offline" doesn't expire ("expires_in" = 0)
+                expires_in = response_auth_json.get("expires_in", 0)
+                _token_cache.put(self.__cache_key, access_token, expires_in)
+                return True
+            self.__on_error(response_auth_json)
+            yield "critical_error", response_auth_json
+            return False
+        finally:
+            self._wipe_creds()
+
+    # Each handler returns new response of auth or None if auth is failed
+    def _on_need_captcha(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        self._logger.info("Captcha is needed!")
+        captcha_sid: str = response_auth_json["captcha_sid"]
+        captcha_img: str = response_auth_json["captcha_img"]
+        captcha_key: str = yield "captcha", captcha_img
+        return (yield "request_auth", (None, (captcha_sid, captcha_key)))
+
+    def _on_need_validation(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        self._logger.info("2FA is needed!")
+        validation_type = response_auth_json["validation_type"]
+        validation_description = response_auth_json["error_description"]
+        if validation_type == "2fa_app":
+            self._logger.info("Code from 2FA app is needed!")
+        else:
+            self._logger.info("%s", validation_description)
+        sid = response_auth_json["validation_sid"]
+        code: str = yield "request_code_and_2fa", sid
+        return (yield "request_auth", (code, None))
+
+    def _on_invalid_request(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        self._logger.warning("Invalid code. Try again!")
+        code: str = yield "2fa", None
+        return (yield "request_auth", (code, None))
+
+    def _on_invalid_client(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        self._logger.error("Login or password is invalid!")
+        yield "invalid_client", None
+
+    def _on_bruteforce_attempt(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        self._logger.error("Password bruteforce attempt!")
+        # No steps, but handler must be generator like others
+        yield from ()
+
+    def _on_unknown_error(
+        self, response_auth_json: dict
+    ) -> Generator[Step, Any, Optional[dict]]:
+        yield "critical_error", response_auth_json
+        self.__on_error(response_auth_json)
+
+    # Handlers of errors by their kind (built once, called with instance)
+    _HANDLERS: Dict[_AuthError, _ErrorHandler] = {
+        _AuthError.UNKNOWN: _on_unknown_error,
+        _AuthError.NEED_CAPTCHA: _on_need_captcha,
+        _AuthError.NEED_VALIDATION: _on_need_validation,
+        _AuthError.INVALID_REQUEST: _on_invalid_request,
+        _AuthError.INVALID_CLIENT: _on_invalid_client,
+        _AuthError.PASSWORD_BRUTEFORCE_ATTEMPT: _on_bruteforce_attempt,
+    }
+
+    ################
+    # TOKEN & CONFIG
+    @staticmethod
+    def clear_token_cache(token: Optional[str] = None) -> None:
+        """
+        Remove token from cache of received tokens (e.g. if it was revoked),
+        so next 'auth' requests new one. Without token whole cache is cleared.
+
+        Args:
+            token (Optional[str]): Token to remove (default value = None - all tokens).
+        """
+        _token_cache.discard(token)
+
+    def get_token(self) -> Optional[str]:
+        """
+        Prints token in console (if authorisation was successful).
+        """
+        token = self.__token
+        if not token:
+            self._logger.warning('Please, first call the method "auth".')
+            return
+        self._logger.info("%s", token)
+        return token
+
+    def _config_text(self) -> Optional[str]:
+        token: str = self.__token
+        if not token:
+            self._logger.warning('Please, first call the method "auth"')
+            return
+        # configparser escapes values (e.g. multiline), file is written at once;
+        # it's imported here, as it's needed only for saving config
+        import configparser
+
+        config = configparser.ConfigParser(interpolation=None)
+        config["VK"] = {"user_agent": self.client.user_agent, "token_for_audio": token}
+        buffer = io.StringIO()
+        config.write(buffer)
+        return buffer.getvalue()
+
+    def save_to_config(self, file_path: str = "config_vk.ini"):
+        """
+        Save token and user agent data in config (if authorisation was successful).
+
+        Args:
+            file_path (str): Filename of config (default value = "config_vk.ini").
+        """
+        config_text = self._config_text()
+        if config_text is None:
+            return
+        full_fp = self.create_path(file_path)
+        if os.path.isfile(full_fp):
+            self._logger.info('File already exist! Enter "OK" for rewriting it')
+            if input().lower() != "ok":
+                return
+        os.makedirs(os.path.dirname(full_fp), exist_ok=True)
+        # One write; token is readable only by owner of file
+        fd = os.open(full_fp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, config_text.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self._logger.info("Token was saved!")
+
+    def __on_error(self, response):
+        self._logger.critical(
+            "Unexpected error! Please, create an issue in repository for solving this problem."
+        )
+        self._logger.critical("%s", response)
+
+    @staticmethod
+    def create_path(file_path: str) -> str:
+        """
+        Create path before and after this for different funcs.
+
+        Args:
+            file_path (str): Relative path to file.
+
+        Returns:
+            str: Absolute path to file.
+        """
+        return os.path.join(_MODULE_DIR, file_path)
@@ -4,12 +4,18 @@ This module contains utilities for conversion and logging.
 Classes:
     Converter: A class for performing various conversion operations.
     get_logger: A function for getting or creating a logger.
+    RateLimiter: A class for limiting count of requests per second.
+    with_retry: A decorator for repeating requests after transient errors.
 """
 
 from .converter import Converter
 from .logger import create_logger
+from .rate_limiter import RateLimiter
+from .retry import with_retry
 
 __all__ = [
     "Converter",
     "create_logger",
+    "RateLimiter",
+    "with_retry",
 ]
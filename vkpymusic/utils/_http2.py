@@ -0,0 +1,12 @@
+"""
+This module checks once, at import, if HTTP/2 can be used by httpx.
+
+HTTP/2 needs optional package 'h2' (extra 'http2' of vkpymusic).
+"""
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
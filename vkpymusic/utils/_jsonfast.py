@@ -0,0 +1,25 @@
+"""
+This module picks the fastest available JSON parser once, at import.
+
+Order: orjson -> ujson -> json (stdlib). All of them accept bytes,
+so 'loads' is called with 'response.content' directly.
+"""
+
+import logging
+
+try:
+    from orjson import loads
+
+    BACKEND = "orjson"
+except ImportError:
+    try:
+        from ujson import loads
+
+        BACKEND = "ujson"
+    except ImportError:
+        from json import loads
+
+        BACKEND = "json"
+
+
+logging.getLogger(__name__).debug("JSON parser: %s", BACKEND)
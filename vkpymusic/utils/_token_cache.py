@@ -0,0 +1,77 @@
+"""
+This module contains the process-wide cache of tokens received by
+'TokenReceiver' and 'TokenReceiverAsync'.
+
+Tokens are kept by HMAC of login, password and client with a random key
+generated once per process, so the cache can't be used to check passwords.
+"""
+
+import os
+import hmac
+import time
+import hashlib
+from typing import Dict, Optional, Tuple
+
+_SECRET = os.urandom(32)
+
+# Received tokens (with expiry time) by key of credentials
+_cache: Dict[bytes, Tuple[str, float]] = {}
+
+
+def make_key(login: str, password: str, client_id: str) -> bytes:
+    """
+    Get key of cache for credentials.
+
+    Args:
+        login (str):     Login to VK.
+        password (str):  Password to VK.
+        client_id (str): ID of client.
+
+    Returns:
+        bytes: Key of cache.
+    """
+    message = f"{login}\0{password}\0{client_id}".encode()
+    return hmac.new(_SECRET, message, hashlib.sha256).digest()
+
+
+def get(key: bytes) -> Optional[str]:
+    """
+    Get cached token if it hasn't expired.
+
+    Args:
+        key (bytes): Key of cache.
+
+    Returns:
+        Optional[str]: Token or None.
+    """
+    cached = _cache.get(key)
+    if cached is None or time.monotonic() >= cached[1]:
+        return None
+    return cached[0]
+
+
+def put(key: bytes, token: str, expires_in: int) -> None:
+    """
+    Save token in cache.
+
+    Args:
+        key (bytes):      Key of cache.
+        token (str):      Token.
+        expires_in (int): Lifetime of token in seconds (0 - token doesn't expire).
+    """
+    expires_at = time.monotonic() + expires_in if expires_in else float("inf")
+    _cache[key] = (token, expires_at)
+
+
+def discard(token: Optional[str] = None) -> None:
+    """
+    Remove token from cache (e.g. if it was revoked) or clear whole cache.
+
+    Args:
+        token (Optional[str]): Token to remove (None - remove all tokens).
+    """
+    if token is None:
+        _cache.clear()
+        return
+    for key in [key for key, (cached, _) in _cache.items() if cached == token]:
+        del _cache[key]
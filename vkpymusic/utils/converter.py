@@ -2,13 +2,13 @@
 This module contains the Converter class.
 """
 
-import json
 import logging
 from typing import List, Optional
 
 from requests import Response
 
 from ..models import Song, Playlist, UserInfo
+from ._jsonfast import loads
 
 
 class Converter:
@@ -27,14 +27,9 @@ class Converter:
         Returns:
             List[Song]: A list of songs converted from the response.
         """
-        response = json.loads(response.content.decode("utf-8"))
-        items = response["response"]["items"]
-
-        songs: List[Song] = []
-        for item in items:
-            song = Song.from_json(item)
-            songs.append(song)
-        return songs
+        data = loads(response.content)
+        items = data["response"]["items"]
+        return list(map(Song.from_json, items))
 
     @staticmethod
     def response_to_playlists(response: Response) -> List[Playlist]:
@@ -47,15 +42,9 @@ class Converter:
         Returns:
             List[Playlist]: A list of playlists converted from the response.
         """
-        response = json.loads(response.content.decode("utf-8"))
-        items = response["response"]["items"]
-
-        playlists: List[Playlist] = []
-        for item in items:
-            playlist = Playlist.from_json(item)
-            playlists.append(playlist)
-
-        return playlists
+        data = loads(response.content)
+        items = data["response"]["items"]
+        return list(map(Playlist.from_json, items))
 
     @staticmethod
     def response_to_userinfo(response: Response) -> Optional[UserInfo]:
@@ -68,8 +57,8 @@ class Converter:
         Returns:
             UserInfo: A UserInfo converted from the response.
         """
-        response = json.loads(response.content.decode("utf-8"))
-        item = response["response"]
+        data = loads(response.content)
+        item = data["response"]
         userinfo: UserInfo = UserInfo.from_json(item)
 
         return userinfo
@@ -85,12 +74,25 @@ class Converter:
         Returns:
             List[Song]: A list of songs converted from the response.
         """
-        response = json.loads(response.content.decode("utf-8"))
-        items = response["response"]
+        data = loads(response.content)
+        items = data["response"]
+        return list(map(Song.from_json, items))
+
+    @staticmethod
+    def response_to_songs_batch(response: Response) -> List[List[Song]]:
+        """
+        Converts a response of 'execute' with 'audio.get' calls to lists of songs.
 
-        songs: List[Song] = []
-        for item in items:
-            song = Song.from_json(item)
-            songs.append(song)
+        Args:
+            response (Response): The response object from VK.
+
+        Returns:
+            List[List[Song]]: A list of songs for each call (empty if call failed).
+        """
+        data = loads(response.content)
+        results = data["response"]
 
-        return songs
\ No newline at end of file
+        return [
+            list(map(Song.from_json, result["items"])) if result else []
+            for result in results
+        ]
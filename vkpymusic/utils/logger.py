@@ -3,8 +3,12 @@ This module provides a logger utility for vkpymusic.
 """
 
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
 import datetime
+from typing import Dict, Optional, Tuple
 
 
 class BCOLORS:
@@ -21,24 +25,79 @@ class BCOLORS:
     ENDC = "\033[0m"
 
 
-_log_format = "%(asctime)s | %(filename)s(%(lineno)d) | %(module)s.%(funcName)s(...) | [%(levelname)s] %(message)s"
+# Place of call is added only if env variable 'VKPYMUSIC_LOG_VERBOSE' is set
+_log_format_verbose = "%(asctime)s | %(filename)s(%(lineno)d) | %(module)s.%(funcName)s(...) | [%(levelname)s] %(message)s"
+_log_format_short = "%(asctime)s | [%(levelname)s] %(name)s: %(message)s"
+_log_format = (
+    _log_format_verbose if os.environ.get("VKPYMUSIC_LOG_VERBOSE") else _log_format_short
+)
 
+# One file handler for all loggers (file is opened once per process);
+# loggers put records in queue, and they are written in background thread
+_file_handler: Optional[logging.handlers.QueueHandler] = None
+# Options ('console', 'file') of already configured loggers by name
+_configured: Dict[str, Tuple[bool, bool]] = {}
 
-def _get_file_handler() -> logging.FileHandler:
+
+class _LazyFileHandler(logging.FileHandler):
+    """
+    A file handler that creates the file (and its folder) on first record.
+    """
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
     """
-    Returns a file handler for logging to a file.
+    A queue handler that starts listener thread (writing records to file
+    handler) on first record, so nothing is started if nothing is logged.
+    """
+
+    def __init__(self, file_handler: logging.Handler) -> None:
+        super().__init__(queue.SimpleQueue())
+        self._file_handler = file_handler
+        self._listener: Optional[logging.handlers.QueueListener] = None
 
-    The log file is created in the 'logs' directory with the name 'vkpymusic_<current_date>.log'.
+    def emit(self, record: logging.LogRecord) -> None:
+        # Called under lock of handler, so listener is started once
+        if self._listener is None:
+            self._listener = logging.handlers.QueueListener(
+                self.queue, self._file_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            # Write remaining records on exit ('logging.shutdown' closes file after it)
+            atexit.register(self._listener.stop)
+        super().emit(record)
+
+
+def _get_file_handler() -> logging.handlers.QueueHandler:
+    """
+    Returns a handler for logging to a file (created on first call).
+
+    Records are passed through a queue to a listener thread (started on first
+    record), which writes them to the file, so logging doesn't block on disk I/O.
+    The log file is created (on first record) in the 'logs' directory with the name
+    'vkpymusic_<current_date>.log'.
 
     Returns:
-        file_handler: A file handler instance for logging to a file.
+        file_handler: A queue handler instance for logging to a file.
     """
+    global _file_handler
+    if _file_handler is not None:
+        return _file_handler
     file_path = f"logs/vkpymusic_{datetime.date.today()}.log"
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    file_handler = logging.FileHandler(file_path)
+    file_handler = _LazyFileHandler(file_path)
     file_handler.setLevel(logging.WARNING)
     file_handler.setFormatter(logging.Formatter(_log_format))
-    return file_handler
+
+    _file_handler = _LazyQueueHandler(file_handler)
+    _file_handler.setLevel(logging.WARNING)
+    return _file_handler
 
 
 def _get_stream_handler() -> logging.StreamHandler:
@@ -61,6 +120,7 @@ def create_logger(
     ) -> logging.Logger:
     """
     Returns a logger instance with configured handlers.
+    Logger is configured once; calls with same options return it as is.
 
     Args:
         name (str): The name of the logger.
@@ -71,11 +131,16 @@ def create_logger(
         logger (logging.Logger): A logger instance with configured handlers.
     """
     logger = logging.getLogger(name)
+    options = (console, file)
+    if _configured.get(name) == options:
+        return logger
     logger.setLevel(logging.INFO)
-    while logger.hasHandlers():
-        logger.removeHandler(logger.handlers[0])
+    # Only own handlers are removed (handlers of parents are kept)
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
     if console:
         logger.addHandler(_get_stream_handler())
     if file:
         logger.addHandler(_get_file_handler())
+    _configured[name] = options
     return logger
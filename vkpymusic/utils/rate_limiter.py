@@ -0,0 +1,70 @@
+"""
+This module contains the RateLimiter class.
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, Optional
+
+
+class RateLimiter:
+    """
+    A class that limits count of requests per second (for VK API = 3).
+
+    Modes:
+        'sequential': requests are spread evenly, one per 1/limit seconds.
+        'burst':      up to 'limit' requests are sent at once, then next ones
+                      wait until a second has passed since the oldest of them.
+
+    Example usage:
+    ```
+    >>> limiter = RateLimiter(3)
+    >>> async with limiter:
+    ...     response = await client.post(...)
+    ```
+    """
+
+    def __init__(self, limit: int = 3, mode: str = "sequential") -> None:
+        """
+        Initializes a RateLimiter object.
+
+        Args:
+            limit (int): Max count of requests per second.
+            mode (str):  'sequential' or 'burst'.
+        """
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        if mode not in ("sequential", "burst"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.limit = limit
+        self.mode = mode
+        # Times of last requests (by clock of event loop)
+        self._times: Deque[float] = deque(maxlen=limit)
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self) -> None:
+        """
+        Wait until next request can be sent.
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            delay = 0.0
+            if self.mode == "sequential":
+                if self._times:
+                    delay = self._times[-1] + 1 / self.limit - loop.time()
+            elif len(self._times) == self.limit:
+                delay = self._times[0] + 1 - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._times.append(loop.time())
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
@@ -0,0 +1,113 @@
+"""
+This module contains the 'with_retry' decorator.
+"""
+
+import time
+import random
+import asyncio
+import functools
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Statuses of response after which request can be repeated
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def _is_retryable(response: Any) -> bool:
+    return getattr(response, "status_code", None) in RETRY_STATUSES
+
+
+def _get_delay(
+    attempt: int, base: float, cap: float, jitter: float, response: Optional[Any] = None
+) -> float:
+    """
+    Get delay before next attempt: 'Retry-After' of response (if it's set)
+    or exponential backoff with jitter.
+
+    Args:
+        attempt (int):  Number of failed attempt (from 0).
+        base (float):   Delay after first attempt (in seconds).
+        cap (float):    Max delay (in seconds).
+        jitter (float): Max part of delay added randomly.
+        response (Optional[Any]): Response of failed attempt.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(cap, float(retry_after))
+    return min(cap, base * 2**attempt) * (1 + random.uniform(0, jitter))
+
+
+def with_retry(
+    max_retries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+    exceptions: Tuple[Type[BaseException], ...] = (),
+    retry_if: Optional[Callable[[Any], bool]] = None,
+) -> Callable[[F], F]:
+    """
+    Repeat request (sync or async function) if it raised one of 'exceptions'
+    or returned response with status 429/5xx (or for which 'retry_if' is True).
+    Response of last attempt is returned as is.
+
+    Args:
+        max_retries (int): Max count of repeats.
+        base (float):      Delay after first attempt (in seconds).
+        cap (float):       Max delay (in seconds).
+        jitter (float):    Max part of delay added randomly.
+        exceptions (Tuple[Type[BaseException], ...]): Errors of connection to retry on.
+        retry_if (Optional[Callable[[Any], bool]]): Check of response for other
+            retryable errors (e.g. errors of VK API sent with status 200).
+
+    Example usage:
+    ```
+    >>> @with_retry(exceptions=(requests.ConnectionError,))
+    ... def request(...) -> requests.Response:
+    ...     ...
+    ```
+    """
+
+    def should_retry(response: Any) -> bool:
+        return _is_retryable(response) or (retry_if is not None and retry_if(response))
+
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_retries + 1):
+                    try:
+                        response = await func(*args, **kwargs)
+                    except exceptions:
+                        if attempt == max_retries:
+                            raise
+                        response = None
+                    else:
+                        if attempt == max_retries or not should_retry(response):
+                            return response
+                    await asyncio.sleep(_get_delay(attempt, base, cap, jitter, response))
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                try:
+                    response = func(*args, **kwargs)
+                except exceptions:
+                    if attempt == max_retries:
+                        raise
+                    response = None
+                else:
+                    if attempt == max_retries or not should_retry(response):
+                        return response
+                time.sleep(_get_delay(attempt, base, cap, jitter, response))
+
+        return wrapper
+
+    return decorator